@@ -1,7 +1,15 @@
 """담양 리트릿 - 한옥 다방 Aesthetic"""
 
+import html
+
 import streamlit as st
 
+from utils.data_loader import enable_copy_on_write
+from utils.tracing import TRACING_ENABLED, finish_rerun, span, spans_frame, start_rerun
+
+start_rerun("app")
+enable_copy_on_write()
+
 st.set_page_config(
     page_title="담양 리트릿",
     page_icon="🎋",
@@ -397,20 +405,45 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Schedule Strip
-st.markdown("""
+from utils.catalog import resolve_region
+
+# Region from the URL, else the previous page's, else the catalog default
+region = resolve_region(st.query_params, st.session_state)
+
+# Schedule Strip (least-travel plan for checkout day, static flow if none fits)
+from utils.hours import format_minutes
+from utils.itinerary import CHECKOUT_MINUTE, get_itinerary_plans
+
+with span("itinerary"):
+    plans = get_itinerary_plans(top_n=1, region=region)
+if plans:
+    schedule_flow = " → ".join(
+        [f"<strong>{format_minutes(CHECKOUT_MINUTE)}</strong> 체크아웃"]
+        + [
+            f"<strong>{format_minutes(stop['arrive'])}</strong> {stop['label']} · {html.escape(stop['name'])}"
+            for stop in plans[0].stops
+        ]
+    ) + f" · 이동 {plans[0].total_km:.1f}km"
+else:
+    schedule_flow = "<strong>11시</strong> 체크아웃 → <strong>점심</strong> → <strong>카페</strong> → <strong>소품샵</strong>"
+
+st.markdown(f"""
 <div class="schedule-strip">
     <span class="schedule-icon">🗓</span>
     <span class="schedule-flow">
-        <strong>11시</strong> 체크아웃 → <strong>점심</strong> → <strong>카페</strong> → <strong>소품샵</strong>
+        {schedule_flow}
     </span>
 </div>
 """, unsafe_allow_html=True)
 
 # Load data
+from utils.cards import render_home_cards
 from utils.data_loader import get_venues_df
+from utils.venue_map import prewarm_venue_maps
 
-df = get_venues_df()
+with span("load"):
+    df = get_venues_df(region)
+    prewarm_venue_maps(region)
 total = len(df)
 restaurants = len(df[df['category'] == 'restaurant'])
 cafes = len(df[df['category'] == 'cafe'])
@@ -461,19 +494,8 @@ st.markdown("""
 restaurant_df = df[df["category"] == "restaurant"]
 restaurant_df = restaurant_df[~restaurant_df["subcategory"].isin(["중식"])]
 
-for _, row in restaurant_df.iterrows():
-    hours_text = f" · {row['hours']}" if row.get('hours') else ""
-    note_tag = f'<span class="venue-tag">💡 {row["note"]}</span>' if row.get('note') and str(row.get('note')) != 'nan' else ""
-    link_html = f'<a href="{row["url"]}" target="_blank" class="venue-link">→</a>' if row['url'] else ""
-
-    st.markdown(f"""
-    <div class="venue-card">
-        {link_html}
-        <div class="venue-name">{row['name']}</div>
-        <div class="venue-detail">{row['feature']}{hours_text}</div>
-        {note_tag}
-    </div>
-    """, unsafe_allow_html=True)
+with span("cards", section="restaurant"):
+    st.markdown(render_home_cards(restaurant_df, show_hours=True, region=region), unsafe_allow_html=True)
 
 st.markdown("---")
 
@@ -486,18 +508,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 cafe_df = df[df["category"] == "cafe"].head(6)
-for _, row in cafe_df.iterrows():
-    note_tag = f'<span class="venue-tag">💡 {row["note"]}</span>' if row.get('note') and str(row.get('note')) != 'nan' else ""
-    link_html = f'<a href="{row["url"]}" target="_blank" class="venue-link">→</a>' if row['url'] else ""
-
-    st.markdown(f"""
-    <div class="venue-card">
-        {link_html}
-        <div class="venue-name">{row['name']}</div>
-        <div class="venue-detail">{row['feature']}</div>
-        {note_tag}
-    </div>
-    """, unsafe_allow_html=True)
+with span("cards", section="cafe"):
+    st.markdown(render_home_cards(cafe_df, region=region), unsafe_allow_html=True)
 
 st.markdown("---")
 
@@ -511,16 +523,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 activity_df = df[df["category"] == "activity"]
-for _, row in activity_df.iterrows():
-    link_html = f'<a href="{row["url"]}" target="_blank" class="venue-link">→</a>' if row['url'] else ""
-
-    st.markdown(f"""
-    <div class="venue-card">
-        {link_html}
-        <div class="venue-name">{row['name']}</div>
-        <div class="venue-detail">{row['feature']}</div>
-    </div>
-    """, unsafe_allow_html=True)
+with span("cards", section="activity"):
+    st.markdown(render_home_cards(activity_df, show_note=False, region=region), unsafe_allow_html=True)
 
 # Footer
 st.markdown("""
@@ -528,3 +532,8 @@ st.markdown("""
     담양 여행의 모든 순간이 특별하길
 </div>
 """, unsafe_allow_html=True)
+
+# Developer timings (DREAMTRIP_TRACE=1)
+if TRACING_ENABLED:
+    with st.expander("⏱ 실행 시간"):
+        st.dataframe(spans_frame(finish_rerun()), hide_index=True)
@@ -0,0 +1,101 @@
+"""Benchmark cases: data loading, filtering, distance and map building.
+
+Each case gets a state dict from ``setup`` (region id and dataset path,
+plus whatever it prepares) and times ``run(state)``.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from utils.compiled import compiled_path, index_path
+from utils.data_loader import (
+    calculate_distance, clear_result_cache, clear_store_cache, compile_dataset, distances_from, filter_venues,
+    get_accommodation, get_venue_store, get_venues_df,
+)
+from utils.venue_map import build_venue_map, get_venue_map_html
+
+OPEN_AT = datetime.datetime(2026, 2, 14, 13, 0)
+
+
+@dataclass(frozen=True)
+class Case:
+    """One timed operation; ``max_size`` skips datasets larger than it."""
+
+    name: str
+    run: Callable
+    setup: Optional[Callable] = None
+    teardown: Optional[Callable] = None
+    max_size: Optional[int] = None
+
+
+def _with_df(state: dict) -> dict:
+    """Add the loaded frame and base camp to the state."""
+    return {**state, "df": get_venues_df(state["region"]), "base": get_accommodation(state["region"])}
+
+
+def _load_cold(state: dict) -> None:
+    clear_store_cache(state["region"])
+    get_venues_df(state["region"])
+
+
+def _compile(state: dict) -> dict:
+    compile_dataset(state["path"])
+    return state
+
+
+def _remove_compiled(state: dict) -> None:
+    compiled_path(state["path"]).unlink(missing_ok=True)
+    index_path(compiled_path(state["path"])).unlink(missing_ok=True)
+    clear_store_cache(state["region"])
+
+
+def _filter(scan: bool = False, cached: bool = False, **kwargs) -> Callable:
+    """A case body calling filter_venues; ``scan`` passes a copy so no index applies.
+
+    Unless ``cached``, the shared result cache is emptied first, so the
+    query is computed every time.
+    """
+    def run(state: dict) -> None:
+        df = state["df"].copy(deep=False) if scan else state["df"]
+        if not cached:
+            clear_result_cache()
+        filter_venues(df, region=state["region"], **kwargs)
+    return run
+
+
+def _query_facets(state: dict) -> None:
+    """Bitmap intersection alone, without taking the rows."""
+    get_venue_store(state["region"]).query_engine.positions(categories=["cafe", "restaurant"], max_distance_km=10)
+
+
+def _distance_scalar(state: dict) -> None:
+    base = state["base"]
+    for lat, lng in zip(state["df"]["lat"].tolist(), state["df"]["lng"].tolist()):
+        calculate_distance(base["lat"], base["lng"], lat, lng)
+
+
+def _distance_vectorized(state: dict) -> None:
+    base = state["base"]
+    distances_from(base["lat"], base["lng"], state["df"]["lat"], state["df"]["lng"])
+
+
+COMBINED = {"categories": ["cafe", "restaurant"], "max_distance_km": 10, "search_query": "카페", "open_at": OPEN_AT}
+
+CASES = (
+    Case("load.cold", _load_cold),
+    Case("load.warm", lambda state: get_venues_df(state["region"])),
+    Case("load.compiled", _load_cold, setup=_compile, teardown=_remove_compiled),
+    Case("filter.category", _filter(categories=["cafe"]), setup=_with_df),
+    Case("filter.radius", _filter(max_distance_km=5), setup=_with_df),
+    Case("filter.search", _filter(search_query="소금빵"), setup=_with_df),
+    Case("filter.open_at", _filter(open_at=OPEN_AT), setup=_with_df),
+    Case("filter.combined", _filter(**COMBINED), setup=_with_df),
+    Case("filter.cached", _filter(cached=True, **COMBINED), setup=_with_df),
+    Case("filter.combined_scan", _filter(scan=True, **COMBINED), setup=_with_df, max_size=100_000),
+    Case("query.facets", _query_facets, setup=_with_df),
+    Case("distance.scalar", _distance_scalar, setup=_with_df),
+    Case("distance.vectorized", _distance_vectorized, setup=_with_df),
+    Case("map.build", lambda state: build_venue_map(region=state["region"]).get_root().render(), max_size=100_000),
+    Case("map.cached", lambda state: get_venue_map_html(region=state["region"]), max_size=100_000),
+)
@@ -0,0 +1,23 @@
+"""Synthetic venue datasets of any size, written as throwaway regions."""
+
+import json
+from pathlib import Path
+
+from utils.generator import write_dataset
+
+
+def write_catalog(root: Path, sizes, seed: int = 0) -> dict:
+    """Write one generated dataset per size under ``root`` plus a catalog listing them.
+
+    Returns {size: region id}.
+    """
+    regions = {}
+    entries = {}
+    for size in sizes:
+        region = f"bench-{size}"
+        path = write_dataset(root / f"{region}.json", size, seed)
+        regions[size] = region
+        entries[region] = {"name": region, "path": path.name}
+    with open(root / "catalog.json", "w", encoding="utf-8") as f:
+        json.dump({"default": regions[sizes[0]], "regions": entries}, f, ensure_ascii=False)
+    return regions
@@ -0,0 +1,50 @@
+"""Memory footprint of the venue frame, plain vs compact store dtypes.
+
+    python -m benchmarks.footprint [VENUES]
+
+Builds a generated dataset (100k venues by default) both as a plain frame
+(object strings, float64) and as the store's compact frame, and prints
+bytes per column and MB per 100k venues.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from utils.data_loader import (
+    CATEGORICAL_COLUMNS, FLOAT32_COLUMNS, TEXT_COLUMNS, _build_venues_df, memory_footprint,
+)
+from utils.generator import write_dataset
+
+DEFAULT_VENUES = 100_000
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else DEFAULT_VENUES
+    with tempfile.TemporaryDirectory(prefix="dreamtrip-footprint-") as root:
+        path = write_dataset(Path(root) / "venues.json", count)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    compact = _build_venues_df(data)
+    plain = compact.astype({
+        **{column: object for column in CATEGORICAL_COLUMNS + TEXT_COLUMNS if column in compact},
+        **{column: "float64" for column in FLOAT32_COLUMNS},
+    })
+    before, after = memory_footprint(plain), memory_footprint(compact)
+
+    print(f"{'column':<14} {'plain MB':>10} {'compact MB':>11}")
+    for column in compact.columns:
+        print(
+            f"{column:<14} {before['columns'][column] / 2**20:>10.2f} "
+            f"{after['columns'][column] / 2**20:>11.2f}  {compact[column].dtype}"
+        )
+    print(f"{'total':<14} {before['total_bytes'] / 2**20:>10.2f} {after['total_bytes'] / 2**20:>11.2f}")
+    print(f"MB per 100k venues: {before['mb_per_100k']} plain, {after['mb_per_100k']} compact")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
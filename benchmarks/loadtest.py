@@ -0,0 +1,236 @@
+"""Concurrent-session load test of Streamlit reruns, in-process with AppTest.
+
+    python -m benchmarks.loadtest                       # 1, 2, 4, 8 sessions on the bundled data
+    python -m benchmarks.loadtest --sessions 1,16 --rounds 3 --venues 100000
+
+Each simulated session is one ``AppTest`` walking ``SCRIPT`` (home, map
+category toggles, list searches, "open now", CSV export) ``--rounds``
+times. All sessions of a level start together and share the process, so
+the shared stores and caches see the same contention as a real server
+(one script thread per session). Per level it reports rerun latency
+percentiles, reruns per second and resident memory per session.
+
+Running ``AppTest`` sessions concurrently needs patches to Streamlit
+internals (see ``_share_app_test_globals``), so the load test only runs on
+the Streamlit release line in ``STREAMLIT_VERSION``; ``--any-streamlit``
+tries another one anyway.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, _git_commit
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_SESSIONS = (1, 2, 4, 8)
+RERUN_TIMEOUT = 120  # seconds
+STREAMLIT_VERSION = "1.66"  # release line the AppTest patches were written against
+
+
+def _widget(widgets, label: str):
+    """The widget with a given label."""
+    return next(widget for widget in widgets if widget.label == label)
+
+
+# (step, action on the session's AppTest); every action ends in exactly one rerun
+SCRIPT = (
+    ("home", lambda at: at.run()),
+    ("map", lambda at: at.switch_page("pages/1_Map.py").run()),
+    ("map.hide_cafe", lambda at: _widget(at.checkbox, "☕ 카페").uncheck().run()),
+    ("map.show_cafe", lambda at: _widget(at.checkbox, "☕ 카페").check().run()),
+    ("places", lambda at: at.switch_page("pages/2_Places.py").run()),
+    ("places.search", lambda at: at.text_input[0].input("소금빵").run()),
+    ("places.chosung", lambda at: at.text_input[0].input("ㅅㄱㅃ").run()),
+    ("places.open_now", lambda at: _widget(at.checkbox, "🕐 지금 영업 중").check().run()),
+    ("places.export", lambda at: _widget(at.button, "📥 다운로드 준비").click().run()),
+)
+
+
+def _share_app_test_globals() -> None:
+    """Make concurrent ``AppTest`` runs safe to interleave.
+
+    ``AppTest.run`` was written for one test at a time: every run installs a
+    mock ``Runtime`` singleton and clears it when done, resets the
+    pages-directory flag, recompiles the script and toggles the
+    ``global.appTest`` option. Here lookups fall back to the last installed
+    runtime, the flag reset goes to a throwaway subclass, scripts compile once
+    into a shared cache and the option simply stays on. These are private
+    attributes; a release without them raises RuntimeError instead of
+    running unpatched.
+    """
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    unsupported = f"The load test patches Streamlit internals written against Streamlit {STREAMLIT_VERSION}"
+    try:
+        from streamlit.runtime.pages_manager import PagesManager
+        from streamlit.runtime.runtime import Runtime
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+    except ImportError as exc:
+        raise RuntimeError(f"{unsupported}; this release lacks {exc.name}") from exc
+
+    patched = {
+        "Runtime._instance": (Runtime, "_instance"),
+        "streamlit.testing.v1.app_test.PagesManager": (app_test, "PagesManager"),
+        "streamlit.testing.v1.app_test.ScriptCache": (app_test, "ScriptCache"),
+        "streamlit.testing.v1.local_script_runner.ScriptCache": (local_script_runner, "ScriptCache"),
+    }
+    missing = [name for name, (owner, attribute) in patched.items() if not hasattr(owner, attribute)]
+    if missing:
+        raise RuntimeError(f"{unsupported}; this release lacks {', '.join(missing)}")
+
+    latest = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest[:] = [cls._instance]
+        if not latest:
+            raise RuntimeError("Runtime hasn't been created!")
+        return latest[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(latest))
+    app_test.PagesManager = type("SessionPagesManager", (PagesManager,), {})
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    config.set_option("global.appTest", True)
+    set_log_level("error")  # per-thread "missing ScriptRunContext" and deprecation notices
+
+
+def _rss_mb() -> float:
+    """Current resident memory of this process (peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _session(rounds: int, start: threading.Barrier, samples: list, errors: list, sessions: list) -> None:
+    """Run the script ``rounds`` times as one session, recording (step, seconds) per rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=RERUN_TIMEOUT)
+    sessions.append(at)  # kept alive until the level is measured
+    start.wait()
+    for _ in range(rounds):
+        for step, action in SCRIPT:
+            begin = time.perf_counter()
+            try:
+                at = action(at)
+            except Exception as exc:  # a failed step should not hide the other sessions' numbers
+                errors.append(f"{step}: {exc!r}")
+                return
+            samples.append((step, time.perf_counter() - begin))
+            if at.exception:
+                errors.append(f"{step}: {at.exception[0].value}")
+                return
+        at.switch_page("app.py")
+
+
+def run_level(count: int, rounds: int) -> dict:
+    """Drive ``count`` concurrent sessions and summarize their reruns."""
+    samples, errors, sessions = [], [], []
+    start = threading.Barrier(count + 1)
+    threads = [
+        threading.Thread(target=_session, args=(rounds, start, samples, errors, sessions), daemon=True)
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    rss_before = _rss_mb()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    rss_after = _rss_mb()
+
+    seconds = np.array([s for _, s in samples]) if samples else np.zeros(1)
+    steps = {}
+    for step, _ in SCRIPT:
+        values = [s for name, s in samples if name == step]
+        if values:
+            steps[step] = round(float(np.percentile(values, 50)) * 1000, 2)
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99]) * 1000
+    return {
+        "sessions": count,
+        "reruns": len(samples),
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+        "max_ms": round(float(seconds.max()) * 1000, 2),
+        "reruns_per_s": round(len(samples) / elapsed, 2),
+        "rss_per_session_mb": round(max(rss_after - rss_before, 0) / count, 2),
+        "step_p50_ms": steps,
+        "errors": errors,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test concurrent Streamlit sessions in-process.")
+    parser.add_argument("--sessions", default=",".join(map(str, DEFAULT_SESSIONS)), help="comma-separated levels")
+    parser.add_argument("--rounds", type=int, default=2, help="script repetitions per session")
+    parser.add_argument("--venues", type=int, help="use a generated dataset of this size instead of the bundled one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results file (default: results/loadtest-<commit>.json)")
+    parser.add_argument(
+        "--any-streamlit", action="store_true", help=f"run on a Streamlit release other than {STREAMLIT_VERSION}.x"
+    )
+    args = parser.parse_args(argv)
+
+    import streamlit
+
+    if not args.any_streamlit and not streamlit.__version__.startswith(STREAMLIT_VERSION + "."):
+        parser.error(
+            f"written against Streamlit {STREAMLIT_VERSION}.x, found {streamlit.__version__} "
+            "(pass --any-streamlit to try it anyway)"
+        )
+
+    with tempfile.TemporaryDirectory(prefix="dreamtrip-load-") as root:
+        if args.venues:
+            # The catalog location is read at import, so point it at the throwaway one first
+            os.environ["DREAMTRIP_CATALOG"] = str(Path(root) / "catalog.json")
+            from benchmarks.datasets import write_catalog
+            write_catalog(Path(root), [args.venues], args.seed)
+
+        _share_app_test_globals()
+        warnings.filterwarnings("ignore", message="CartoDB tiles")
+        # One warm-up session so the first level does not pay for imports and store builds
+        run_level(1, 1)
+        levels = []
+        for count in sorted({int(n) for n in args.sessions.split(",")}):
+            level = run_level(count, args.rounds)
+            levels.append(level)
+            print(
+                f"{count:>3} sessions  {level['reruns']:>5} reruns  p50 {level['p50_ms']:>9.1f} ms  "
+                f"p95 {level['p95_ms']:>9.1f} ms  p99 {level['p99_ms']:>9.1f} ms  "
+                f"{level['reruns_per_s']:>7.1f} reruns/s  {level['rss_per_session_mb']:>7.2f} MB/session",
+                flush=True,
+            )
+            for error in level["errors"]:
+                print(f"    ERROR {error}")
+
+    commit = _git_commit()
+    output = args.output or RESULTS_DIR / f"loadtest-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"commit": commit, "venues": args.venues, "rounds": args.rounds, "levels": levels}, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {output}")
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
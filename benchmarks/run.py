@@ -0,0 +1,173 @@
+"""Run the benchmark suite and compare against a previous run.
+
+    python -m benchmarks.run                         # all cases, 10^2..10^6 venues
+    python -m benchmarks.run --sizes 100,10000 --cases filter
+    python -m benchmarks.run --baseline <rev>        # fail on regressions vs that commit's run
+
+Every case runs once untimed under tracemalloc (warm-up, and the peak
+memory of a first call), then is timed until ``--repeat`` samples or
+``--budget`` seconds. Results go to ``benchmarks/results/<commit>.json``;
+with ``--baseline`` (a results file or a commit), a case whose p50 latency
+or peak memory grew by more than the threshold makes the run exit with
+status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+TIME_THRESHOLD = 0.25  # allowed p50 growth before a case counts as a regression
+MEMORY_THRESHOLD = 0.25  # allowed peak memory growth
+MIN_TIME_DELTA_MS = 0.05  # ignore timer noise on very fast cases
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+def _git_commit() -> str:
+    """Short hash of HEAD, or "local" outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def measure(case, state: dict, size: int, repeat: int, budget: float) -> dict:
+    """Time one case on one dataset."""
+    tracemalloc.start()
+    case.run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat and (not samples or time.perf_counter() - started < budget):
+        begin = time.perf_counter()
+        case.run(state)
+        samples.append(time.perf_counter() - begin)
+
+    p50, p99 = np.percentile(samples, [50, 99])
+    return {
+        "case": case.name,
+        "size": size,
+        "samples": len(samples),
+        "p50_ms": round(p50 * 1000, 4),
+        "p99_ms": round(p99 * 1000, 4),
+        "mean_ms": round(float(np.mean(samples)) * 1000, 4),
+        "venues_per_s": round(size / p50, 1) if p50 > 0 else None,
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+
+def run_suite(sizes, pattern: str = "", repeat: int = 30, budget: float = 2.0, seed: int = 0) -> list:
+    """Run every case matching ``pattern`` on synthetic datasets of the given sizes."""
+    with tempfile.TemporaryDirectory(prefix="dreamtrip-bench-") as root:
+        # The catalog location is read at import, so point it at the throwaway one first
+        os.environ["DREAMTRIP_CATALOG"] = str(Path(root) / "catalog.json")
+        warnings.filterwarnings("ignore", message="CartoDB tiles")
+        from benchmarks.cases import CASES
+        from benchmarks.datasets import write_catalog
+        from utils.data_loader import clear_store_cache
+
+        regions = write_catalog(Path(root), sizes, seed)
+        results = []
+        for size in sizes:
+            state = {"region": regions[size], "path": Path(root) / f"{regions[size]}.json"}
+            for case in CASES:
+                if pattern not in case.name or (case.max_size is not None and size > case.max_size):
+                    continue
+                case_state = case.setup(state) if case.setup else state
+                result = measure(case, case_state, size, repeat, budget)
+                if case.teardown:
+                    case.teardown(case_state)
+                results.append(result)
+                print(
+                    f"{case.name:<22} {size:>9,}  p50 {result['p50_ms']:>11.3f} ms  "
+                    f"p99 {result['p99_ms']:>11.3f} ms  peak {result['peak_mb']:>9.2f} MB",
+                    flush=True,
+                )
+            clear_store_cache(regions[size])
+        return results
+
+
+def compare(results: list, baseline: list, time_threshold: float, memory_threshold: float) -> list:
+    """Get a message per case that regressed against the baseline."""
+    previous = {(r["case"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        label = f"{result['case']} @ {result['size']:,}"
+        slower = result["p50_ms"] - before["p50_ms"]
+        if slower > MIN_TIME_DELTA_MS and result["p50_ms"] > before["p50_ms"] * (1 + time_threshold):
+            regressions.append(f"{label}: p50 {before['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms")
+        grown = result["peak_mb"] - before["peak_mb"]
+        if grown > MIN_MEMORY_DELTA_MB and result["peak_mb"] > before["peak_mb"] * (1 + memory_threshold):
+            regressions.append(f"{label}: peak {before['peak_mb']:.2f} -> {result['peak_mb']:.2f} MB")
+    return regressions
+
+
+def _baseline_path(value: str) -> Path:
+    """A results file path, or the saved run of a commit."""
+    path = Path(value)
+    return path if path.suffix == ".json" else RESULTS_DIR / f"{value}.json"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark venue loading, filtering, distance and map building.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated venue counts")
+    parser.add_argument("--cases", default="", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=30, help="max timed samples per case")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of sampling per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results file (default: results/<commit>.json)")
+    parser.add_argument("--baseline", help="results file or commit to compare against")
+    parser.add_argument("--threshold", type=float, default=TIME_THRESHOLD, help="allowed p50 growth")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD, help="allowed peak growth")
+    args = parser.parse_args(argv)
+
+    sizes = sorted({int(size) for size in args.sizes.split(",")})
+    commit = _git_commit()
+    results = run_suite(sizes, args.cases, args.repeat, args.budget, args.seed)
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {output}")
+
+    if args.baseline:
+        with open(_baseline_path(args.baseline), "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
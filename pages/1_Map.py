@@ -1,10 +1,15 @@
 """지도 - 한옥 다방 Aesthetic"""
 
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
 
-from utils.data_loader import get_venues_df, get_accommodation, CATEGORY_INFO
+from utils.catalog import resolve_region
+from utils.data_loader import enable_copy_on_write, get_venues_df, filter_venues, get_result_cache_stats, CATEGORY_INFO
+from utils.tracing import TRACING_ENABLED, finish_rerun, span, spans_frame, start_rerun
+from utils.venue_map import get_venue_map_html, prewarm_venue_maps
+
+start_rerun("map")
+enable_copy_on_write()
 
 st.set_page_config(
     page_title="지도 - 담양 리트릿",
@@ -118,9 +123,13 @@ if st.button("← 홈으로", type="secondary"):
 
 st.markdown('<h1 class="page-title">🗺️ 담양 지도</h1>', unsafe_allow_html=True)
 
+# Region from the URL, else the previous page's, else the catalog default
+region = resolve_region(st.query_params, st.session_state)
+
 # Load data
-df = get_venues_df()
-accommodation = get_accommodation()
+with span("load"):
+    df = get_venues_df(region)
+    prewarm_venue_maps(region)
 
 # Base banner
 st.markdown("""
@@ -146,76 +155,16 @@ if show_restaurant: categories.append("restaurant")
 if show_cafe: categories.append("cafe")
 if show_activity: categories.append("activity")
 
-filtered_df = df[df["category"].isin(categories)] if categories else df
+# Filter results are shared across sessions (see filter_venues)
+with span("filter", categories=len(categories)):
+    filtered_df = filter_venues(df, categories=categories, region=region)
 st.caption(f"{len(filtered_df)}개 장소 표시")
 
-# Create map with warm tones
-m = folium.Map(
-    location=[accommodation["lat"], accommodation["lng"]],
-    zoom_start=11,
-    tiles="cartodbpositron",
-)
-
-# Distance circles with warm colors
-folium.Circle(
-    location=[accommodation["lat"], accommodation["lng"]],
-    radius=5000,
-    color="#5D4037",
-    weight=2,
-    fill=True,
-    fill_opacity=0.05,
-    popup="5km",
-).add_to(m)
-
-folium.Circle(
-    location=[accommodation["lat"], accommodation["lng"]],
-    radius=10000,
-    color="#C17F59",
-    weight=1,
-    fill=False,
-    popup="10km",
-).add_to(m)
-
-# Accommodation marker with emphasis
-folium.CircleMarker(
-    location=[accommodation["lat"], accommodation["lng"]],
-    radius=18,
-    color="#dc2626",
-    weight=3,
-    fill=True,
-    fill_color="#fecaca",
-    fill_opacity=0.6,
-).add_to(m)
-
-folium.Marker(
-    location=[accommodation["lat"], accommodation["lng"]],
-    popup=folium.Popup(
-        f"""<div style="text-align:center; min-width:120px; font-family: sans-serif;">
-            <b style="color:#dc2626;">🏡 BASE</b><br>
-            {accommodation['name'][:10]}...
-        </div>""",
-        max_width=150
-    ),
-    icon=folium.Icon(color="red", icon="home", prefix="fa"),
-).add_to(m)
-
-# Venue markers
-color_map = {"restaurant": "green", "cafe": "orange", "activity": "purple"}
-icon_map = {"restaurant": "utensils", "cafe": "coffee", "activity": "palette"}
-
-for _, row in filtered_df.iterrows():
-    cat = row["category"]
-    popup_text = f"<b>{row['name']}</b><br><small>{row['feature']}</small>"
-
-    folium.Marker(
-        location=[row["lat"], row["lng"]],
-        popup=folium.Popup(popup_text, max_width=180),
-        tooltip=row["name"],
-        icon=folium.Icon(color=color_map.get(cat, "gray"), icon=icon_map.get(cat, "info"), prefix="fa"),
-    ).add_to(m)
-
-# Render map
-st_folium(m, width=None, height=380, use_container_width=True)
+# Render map (cached per category combination)
+with span("map.html", categories=len(categories)):
+    map_html = get_venue_map_html(categories, region=region)
+with span("map.embed", bytes=len(map_html)):
+    components.html(map_html, height=380)
 
 # Legend
 st.markdown("""
@@ -229,12 +178,20 @@ st.markdown("""
 
 # Venue list
 st.markdown("---")
-for cat in categories:
-    cat_df = filtered_df[filtered_df["category"] == cat]
-    if not cat_df.empty:
-        emoji = CATEGORY_INFO[cat]["emoji"]
-        label = CATEGORY_INFO[cat]["label"]
-        with st.expander(f"{emoji} {label} ({len(cat_df)})", expanded=False):
-            for _, row in cat_df.iterrows():
-                url_link = f" [→]({row['url']})" if row['url'] else ""
-                st.markdown(f"**{row['name']}** - {row['feature']}{url_link}")
+with span("venue_list"):
+    for cat in categories:
+        cat_df = filter_venues(df, categories=[cat], region=region)
+        if not cat_df.empty:
+            emoji = CATEGORY_INFO[cat]["emoji"]
+            label = CATEGORY_INFO[cat]["label"]
+            with st.expander(f"{emoji} {label} ({len(cat_df)})", expanded=False):
+                for _, row in cat_df.iterrows():
+                    url_link = f" [→]({row['url']})" if row['url'] else ""
+                    st.markdown(f"**{row['name']}** - {row['feature']}{url_link}")
+
+# Developer timings (DREAMTRIP_TRACE=1)
+if TRACING_ENABLED:
+    with st.expander("⏱ 실행 시간"):
+        st.dataframe(spans_frame(finish_rerun()), hide_index=True)
+        stats = get_result_cache_stats()
+        st.caption(f"필터 결과 캐시: 적중률 {stats['hit_rate']:.0%} · {stats['size']}개 · {stats['nbytes'] / 2**20:.1f} MB")
@@ -1,7 +1,18 @@
 """장소 목록 - 한옥 다방 Aesthetic"""
 
 import streamlit as st
-from utils.data_loader import get_venues_df, get_accommodation, calculate_distance, CATEGORY_INFO
+from utils.cards import render_list_cards
+from utils.catalog import resolve_region
+from utils.data_loader import enable_copy_on_write, get_venues_df, filter_venues, get_result_cache_stats, top_k
+from utils.export import EXPORT_FORMATS, get_export
+from utils.hours import now_local
+from utils.routing import get_travel_minutes, has_road_graph
+from utils.tracing import TRACING_ENABLED, finish_rerun, span, spans_frame, start_rerun
+
+PAGE_SIZES = [20, 50, 100]
+
+start_rerun("places")
+enable_copy_on_write()
 
 st.set_page_config(
     page_title="목록 - 담양 리트릿",
@@ -148,25 +159,26 @@ if st.button("← 홈으로", type="secondary"):
 
 st.markdown('<h1 class="page-title">📋 장소 목록</h1>', unsafe_allow_html=True)
 
+# Region from the URL, else the previous page's, else the catalog default
+region = resolve_region(st.query_params, st.session_state)
+
 # Load data
-df = get_venues_df()
-accommodation = get_accommodation()
+with span("load"):
+    df = get_venues_df(region)
 
-# Calculate distances
-df["distance_km"] = df.apply(
-    lambda row: calculate_distance(accommodation["lat"], accommodation["lng"], row["lat"], row["lng"]),
-    axis=1
-)
+# Sort by road travel time when a road graph is installed, else straight-line distance
+by_travel_time = has_road_graph(region)
+sort_label = "이동시간순 정렬" if by_travel_time else "거리순 정렬"
 
 # Base banner
-st.markdown("""
+st.markdown(f"""
 <div class="base-banner">
-    <strong style="color: #4A6741;">🏡 BASE</strong> 담양힐링파크 새연리조트 · 거리순 정렬
+    <strong style="color: #4A6741;">🏡 BASE</strong> 담양힐링파크 새연리조트 · {sort_label}
 </div>
 """, unsafe_allow_html=True)
 
 # Search
-search = st.text_input("🔍 검색", placeholder="장소명, 특징...")
+search = st.text_input("🔍 검색", placeholder="장소명, 특징, 초성(ㅅㄱㅃ)...")
 
 # Category filter
 col1, col2, col3 = st.columns(3)
@@ -183,46 +195,51 @@ if show_restaurant: categories.append("restaurant")
 if show_cafe: categories.append("cafe")
 if show_activity: categories.append("activity")
 
-filtered = df[df["category"].isin(categories)] if categories else df
-
-if search:
-    search_lower = search.lower()
-    filtered = filtered[
-        filtered["name"].str.lower().str.contains(search_lower, na=False) |
-        filtered["feature"].str.lower().str.contains(search_lower, na=False)
-    ]
+open_now = st.checkbox("🕐 지금 영업 중", key="open_now", help="영업시간 정보가 있는 곳만 표시")
+open_at = now_local() if open_now else None
 
-filtered = filtered.sort_values("distance_km")
+with span("filter", search=bool(search), open_now=open_now):
+    filtered = filter_venues(df, categories=categories, search_query=search, open_at=open_at, region=region)
+if by_travel_time:
+    with span("travel_min"):
+        filtered = filtered.assign(travel_min=get_travel_minutes(region=region).loc[filtered.index])
 st.caption(f"{len(filtered)}개 장소")
 st.markdown("---")
 
-# Display venues
-cat_colors = {"restaurant": "cat-restaurant", "cafe": "cat-cafe", "activity": "cat-activity"}
-
-for _, row in filtered.iterrows():
-    cat = row["category"]
-    cat_info = CATEGORY_INFO.get(cat, {"emoji": "", "label": cat})
-    badge_class = cat_colors.get(cat, "cat-cafe")
-
-    hours_text = f"🕐 {row['hours']}" if row.get('hours') and str(row.get('hours')) != 'nan' else ""
-    note_text = f"💡 {row['note']}" if row.get('note') and str(row.get('note')) != 'nan' else ""
-    meta_parts = [p for p in [hours_text, f"📍 {row['distance_km']:.1f}km", note_text] if p]
-    link_html = f'<a href="{row["url"]}" target="_blank" class="venue-link">🔗</a>' if row['url'] else ""
-
-    st.markdown(f"""
-    <div class="venue-card">
-        {link_html}
-        <span class="category-badge {badge_class}">{cat_info['emoji']} {cat_info['label']}</span>
-        <div class="venue-name">{row['name']}</div>
-        <div class="venue-detail">{row['feature']}</div>
-        <div class="venue-meta">{' · '.join(meta_parts)}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# CSV Download
+# Display venues: only the visible pages, closest first
+page_size = st.selectbox("한 번에 보기", PAGE_SIZES, key="page_size")
+filter_state = (region, search, tuple(categories), open_now, page_size)
+if st.session_state.get("list_filter_state") != filter_state:
+    st.session_state.list_filter_state = filter_state
+    st.session_state.list_pages = 1
+
+visible = top_k(
+    filtered, st.session_state.list_pages * page_size, "travel_min" if by_travel_time else "distance_km"
+)
+with span("cards", count=len(visible)):
+    st.markdown(render_list_cards(visible, region), unsafe_allow_html=True)
+
+if len(visible) < len(filtered):
+    if st.button(f"더 보기 ({len(visible)}/{len(filtered)})", use_container_width=True):
+        st.session_state.list_pages += 1
+        st.rerun()
+
+# Export
 st.markdown("---")
-if st.button("📥 CSV 다운로드"):
-    csv_df = filtered[["name", "category", "feature", "address", "hours", "distance_km"]]
-    csv_df.columns = ["장소명", "카테고리", "특징", "주소", "운영시간", "거리(km)"]
-    csv = csv_df.to_csv(index=False).encode("utf-8-sig")
-    st.download_button("다운로드", csv, "damyang_venues.csv", "text/csv")
+export_format = st.selectbox(
+    "📥 내보내기 형식", list(EXPORT_FORMATS), format_func=lambda fmt: EXPORT_FORMATS[fmt]["label"]
+)
+if st.button("📥 다운로드 준비"):
+    info = EXPORT_FORMATS[export_format]
+    with span("export", format=export_format):
+        data = get_export(
+            filtered, export_format, categories=categories, search_query=search, open_at=open_at, region=region
+        )
+    st.download_button("다운로드", data, f"damyang_venues.{info['extension']}", info["mime"])
+
+# Developer timings (DREAMTRIP_TRACE=1)
+if TRACING_ENABLED:
+    with st.expander("⏱ 실행 시간"):
+        st.dataframe(spans_frame(finish_rerun()), hide_index=True)
+        stats = get_result_cache_stats()
+        st.caption(f"필터 결과 캐시: 적중률 {stats['hit_rate']:.0%} · {stats['size']}개 · {stats['nbytes'] / 2**20:.1f} MB")
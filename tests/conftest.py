@@ -0,0 +1,36 @@
+"""Throwaway venue datasets served as the default region."""
+
+import shutil
+
+import pytest
+
+import utils.data_loader as data_loader
+from utils.catalog import Catalog, Region
+from utils.data_loader import DATA_PATH, clear_result_cache, clear_store_cache, enable_copy_on_write
+from utils.generator import write_dataset
+
+GENERATED_VENUES = 2000
+
+# As the app's entry scripts do: shared frames are handed out as shallow slices
+enable_copy_on_write()
+
+
+@pytest.fixture(scope="module", params=["bundled", "generated"])
+def dataset(request, tmp_path_factory):
+    """Path of a private copy of the bundled dataset, or of a seeded generated one, loaded as the default region.
+
+    Shared by the tests of a module; tests that edit the file restore it.
+    """
+    path = tmp_path_factory.mktemp(request.param) / "venues.json"
+    if request.param == "bundled":
+        shutil.copy(DATA_PATH, path)
+    else:
+        write_dataset(path, GENERATED_VENUES, seed=0, extra_areas=3)
+    catalog = Catalog(default="test", regions={"test": Region(id="test", name="test", path=path)})
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(data_loader, "load_catalog", lambda: catalog)
+        clear_store_cache()
+        clear_result_cache()
+        yield path
+    clear_store_cache()
+    clear_result_cache()
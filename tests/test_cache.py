@@ -0,0 +1,114 @@
+"""LRU cache bounds, expiry and single-flight builds, and the shared filter result cache."""
+
+import threading
+import time
+
+import pytest
+
+from utils.cache import LRUCache
+from utils.data_loader import filter_venues, get_result_cache_stats, get_venue_store
+
+
+class FakeClock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_over_maxbytes():
+    cache = LRUCache(maxsize=10, maxbytes=10)
+    cache.put("a", "x" * 4)
+    cache.put("b", "x" * 4)
+    cache.put("c", "x" * 4)
+    assert "a" not in cache and len(cache) == 2
+    assert cache.stats()["nbytes"] == 8
+    cache.put("big", "x" * 11)  # larger than the whole cache: not stored
+    assert "big" not in cache and len(cache) == 2
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None and "a" not in cache
+    assert cache.stats()["expirations"] == 1
+    assert cache.get_or_create("a", lambda: 2) == 2
+
+
+def test_discard_and_clear():
+    cache = LRUCache(maxbytes=100)
+    for key in range(5):
+        cache.put(key, "x")
+    assert cache.discard(lambda key: key % 2 == 0) == 3
+    assert len(cache) == 2 and cache.stats()["nbytes"] == 2
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["nbytes"] == 0
+
+
+def test_stats():
+    cache = LRUCache()
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_get_or_create_is_single_flight():
+    cache = LRUCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_get_or_create_retries_after_failure():
+    cache = LRUCache()
+
+    def fail():
+        raise RuntimeError("build failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("k", fail)
+    assert cache.get_or_create("k", lambda: 1) == 1
+
+
+def test_filter_results_are_shared_but_not_writable(dataset):
+    df = get_venue_store().df
+    first = filter_venues(df, categories=["cafe"])
+    hits = get_result_cache_stats()["hits"]
+    second = filter_venues(df, categories=["cafe"])
+    assert get_result_cache_stats()["hits"] == hits + 1
+    assert second["id"].tolist() == first["id"].tolist()
+
+    first.loc[first.index[:1], "name"] = "바뀐 이름"
+    assert "바뀐 이름" not in filter_venues(df, categories=["cafe"])["name"].tolist()
+    assert "바뀐 이름" not in df["name"].tolist()
@@ -0,0 +1,77 @@
+"""Stores loaded from the compiled Arrow artifact against stores parsed from JSON."""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.compiled import compiled_path, index_path
+from utils.data_loader import clear_store_cache, compile_dataset, get_venue_store
+
+QUERIES = ["카페", "소금빵", "한옥 카페", "ㅅㄱㅃ", "속", "없는가게"]
+
+
+@pytest.fixture
+def json_store(dataset):
+    """The store parsed from JSON, with the artifact compiled next to the dataset (removed afterwards)."""
+    clear_store_cache()
+    store = get_venue_store()
+    target = compile_dataset(dataset)
+    clear_store_cache()
+    yield store
+    target.unlink(missing_ok=True)
+    index_path(target).unlink(missing_ok=True)
+    clear_store_cache()
+
+
+def _assert_same_store(store, expected):
+    pd.testing.assert_frame_equal(store.df, expected.df)
+    assert store.accommodation == expected.accommodation
+    assert store.areas == expected.areas
+    assert store.version == expected.version
+    for query in QUERIES:
+        for mode in ("and", "or"):
+            assert store.search_index.query(query, mode).tolist() == expected.search_index.query(query, mode).tolist()
+    for weekday in range(7):
+        for minute in range(0, 24 * 60, 45):
+            assert np.array_equal(
+                store.hours_index.open_at(weekday, minute, 30), expected.hours_index.open_at(weekday, minute, 30)
+            )
+
+
+def test_compiled_store_matches_json(dataset, json_store):
+    store = get_venue_store()
+    assert store.raw_data is None  # memory-mapped, not parsed
+    _assert_same_store(store, json_store)
+    assert store.data["venues"] == json.loads(dataset.read_text(encoding="utf-8"))["venues"]
+
+
+def test_compiled_without_index_file(dataset, json_store):
+    index_path(compiled_path(dataset)).unlink()
+    store = get_venue_store()
+    assert store.raw_data is None
+    _assert_same_store(store, json_store)
+
+
+def test_touched_source_keeps_artifact(dataset, json_store):
+    stat = dataset.stat()
+    os.utime(dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    store = get_venue_store()
+    assert store.raw_data is None  # same content hash
+    _assert_same_store(store, json_store)
+
+
+def test_edited_source_ignores_artifact(dataset, json_store):
+    original = dataset.read_text(encoding="utf-8")
+    data = json.loads(original)
+    data["venues"][0]["name"] = "새 이름"
+    try:
+        dataset.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        clear_store_cache()
+        store = get_venue_store()
+        assert store.raw_data is not None
+        assert store.df["name"].iloc[0] == "새 이름"
+    finally:
+        dataset.write_text(original, encoding="utf-8")
@@ -0,0 +1,60 @@
+"""Vectorized coordinate generation against the JS getCoords it mirrors."""
+
+import math
+
+import numpy as np
+import pytest
+
+from utils.data_loader import COORD_SPREAD, compute_coords, js_string_hashes
+
+AREAS = {
+    "eup": {"name": "담양읍", "lat": 35.3211, "lng": 126.9882},
+    "lake": {"name": "담양호", "lat": 35.3893, "lng": 127.0061},
+}
+
+
+def _js_hash(name: str) -> int:
+    """``hash = s.charCodeAt(i) + ((hash << 5) - hash); hash |= 0``, one UTF-16 code unit at a time."""
+    units = name.encode("utf-16-le")
+    value = 0
+    for i in range(0, len(units), 2):
+        value = (int.from_bytes(units[i:i + 2], "little") + (value << 5) - value) & 0xFFFFFFFF
+    return value - (1 << 32) if value >= 1 << 31 else value
+
+
+NAMES = [
+    "",
+    "a",
+    "Cafe 온",
+    "베비에르 담양점",
+    "죽녹원",
+    "소쇄원 앞 국수거리 원조 진우네집국수",  # long enough to wrap many times
+    "🎋 대나무 카페",  # astral character: a surrogate pair in JS
+    "😀😀",
+    "담양 " * 40,
+    12345,  # non-string names hash their str()
+]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_js_string_hash(name):
+    assert js_string_hashes([name]).tolist() == [_js_hash(str(name))]
+
+
+def test_js_string_hashes_batch():
+    names = NAMES * 3 + [f"장소 {i}" for i in range(500)]
+    assert js_string_hashes(names).tolist() == [_js_hash(str(name)) for name in names]
+    assert js_string_hashes([]).shape == (0,)
+
+
+def test_compute_coords():
+    names = ["죽녹원", "메타세쿼이아길", "🎋 대나무 카페", ""]
+    area_keys = ["eup", "lake", "missing", "lake"]
+    lats, lngs, area_names = compute_coords(names, area_keys, AREAS)
+    for name, key, lat, lng, area_name in zip(names, area_keys, lats, lngs, area_names):
+        area = AREAS.get(key, AREAS["eup"])
+        value = _js_hash(name)
+        assert lat == pytest.approx(area["lat"] + ((math.sin(value) + 1) / 2 - 0.5) * COORD_SPREAD, abs=1e-12)
+        assert lng == pytest.approx(area["lng"] + ((math.cos(value) + 1) / 2 - 0.5) * COORD_SPREAD, abs=1e-12)
+        assert area_name == area["name"]
+    assert isinstance(lats, np.ndarray)
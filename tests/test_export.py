@@ -0,0 +1,95 @@
+"""Venue exports parsed back and compared with the frame they were made from."""
+
+import io
+import json
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pandas as pd
+import pytest
+
+import utils.export as export
+from utils.data_loader import filter_venues, get_venue_store
+from utils.export import EXPORT_COLUMNS, EXPORT_FORMATS, export_venues, get_export
+
+KML = "{http://www.opengis.net/kml/2.2}"
+SHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value)
+
+
+def _expected(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("distance_km", kind="stable")
+
+
+def test_csv(dataset):
+    df = _expected(get_venue_store().df)
+    parsed = pd.read_csv(io.BytesIO(export_venues(df, "csv")), encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    assert list(parsed.columns) == list(EXPORT_COLUMNS.values())
+    assert parsed["장소명"].tolist() == df["name"].tolist()
+    assert parsed["운영시간"].tolist() == [_text(value) for value in df["hours"]]
+    assert parsed["거리(km)"].astype(float).tolist() == pytest.approx(df["distance_km"].astype(float).tolist())
+
+
+def test_geojson(dataset):
+    df = _expected(get_venue_store().df)
+    features = json.loads(export_venues(df, "geojson"))["features"]
+    assert [f["properties"]["name"] for f in features] == df["name"].tolist()
+    assert [f["properties"]["feature"] for f in features] == [_text(value) for value in df["feature"]]
+    lngs, lats = zip(*(f["geometry"]["coordinates"] for f in features))
+    assert list(lats) == pytest.approx(df["lat"].astype(float).tolist(), abs=1e-6)
+    assert list(lngs) == pytest.approx(df["lng"].astype(float).tolist(), abs=1e-6)
+
+
+def test_kml(dataset):
+    df = _expected(get_venue_store().df)
+    placemarks = ET.fromstring(export_venues(df, "kml")).iter(f"{KML}Placemark")
+    assert [p.find(f"{KML}name").text for p in placemarks] == df["name"].tolist()
+
+
+def test_xlsx(dataset):
+    df = _expected(get_venue_store().df)
+    with zipfile.ZipFile(io.BytesIO(export_venues(df, "xlsx"))) as archive:
+        sheet = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = [
+        [cell.findtext(f"{SHEET}is/{SHEET}t") or cell.findtext(f"{SHEET}v") or "" for cell in row]
+        for row in sheet.iter(f"{SHEET}row")
+    ]
+    assert rows[0] == list(EXPORT_COLUMNS.values())
+    assert [row[0] for row in rows[1:]] == df["name"].tolist()
+    assert [float(row[-1]) for row in rows[1:]] == pytest.approx(df["distance_km"].astype(float).tolist(), abs=0.01)
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_chunking_does_not_change_output(dataset, monkeypatch, fmt):
+    df = get_venue_store().df
+    whole = export_venues(df, fmt)
+    monkeypatch.setattr(export, "CHUNK_ROWS", 7)
+    if fmt == "xlsx":
+        with zipfile.ZipFile(io.BytesIO(whole)) as a, zipfile.ZipFile(io.BytesIO(export_venues(df, fmt))) as b:
+            assert a.read("xl/worksheets/sheet1.xml") == b.read("xl/worksheets/sheet1.xml")
+    else:
+        assert export_venues(df, fmt) == whole
+
+
+def test_empty_export(dataset):
+    df = get_venue_store().df.iloc[:0]
+    assert json.loads(export_venues(df, "geojson"))["features"] == []
+    assert export_venues(df, "csv").decode("utf-8-sig").strip() == ",".join(EXPORT_COLUMNS.values())
+
+
+def test_get_export_is_cached_per_filter_state(dataset):
+    df = get_venue_store().df
+    cafes = filter_venues(df, categories=["cafe"])
+    first = get_export(cafes, "csv", categories=["cafe"])
+    hits = export.get_export_cache_stats()["hits"]
+    assert get_export(cafes, "csv", categories=["cafe"]) is first
+    assert export.get_export_cache_stats()["hits"] == hits + 1
+    assert get_export(cafes, "geojson", categories=["cafe"]) != first
+
+
+def test_unknown_format(dataset):
+    with pytest.raises(ValueError):
+        export_venues(get_venue_store().df, "pdf")
@@ -0,0 +1,76 @@
+"""Chosung and jamo prefix search for as-you-type Hangul input."""
+
+import numpy as np
+import pytest
+
+from utils.data_loader import get_venue_store
+from utils.hangul import (
+    MAX_KEY_LENGTH,
+    HangulPrefixIndex,
+    chosung,
+    decompose,
+    is_chosung_query,
+    prefix_matches,
+    word_start_suffixes,
+)
+
+
+@pytest.mark.parametrize("text, jamo", [
+    ("닭", "ㄷㅏㄹㄱ"),
+    ("소금빵", "ㅅㅗㄱㅡㅁㅃㅏㅇ"),
+    ("왜", "ㅇㅗㅐ"),  # compound vowel as two keystrokes
+    ("LP카페", "lpㅋㅏㅍㅔ"),
+    ("", ""),
+])
+def test_decompose(text, jamo):
+    assert decompose(text) == jamo
+
+
+def test_chosung():
+    assert chosung("소금빵") == "ㅅㄱㅃ"
+    assert chosung("담양 Cafe") == "ㄷㅇ cafe"
+    assert is_chosung_query("ㅅㄱ ㅃ")
+    assert not is_chosung_query("ㅅ금")
+    assert not is_chosung_query("  ")
+
+
+def test_word_start_suffixes():
+    assert word_start_suffixes("담양 소금빵(본점)") == ["담양소금빵본점", "소금빵본점", "본점"]
+
+
+@pytest.mark.parametrize("text, query, matches", [
+    ("소금빵 천국", "ㅅㄱㅃ", True),
+    ("소금빵 천국", "ㅊㄱ", True),  # any word start
+    ("소금빵 천국", "ㄱㅃ", False),  # not mid-word
+    ("소금빵 천국", "속", True),  # syllable still being typed
+    ("소금빵 천국", "소금ㅃ", True),
+    ("소금빵 천국", "빵천", False),
+    ("소금빵 천국", "소금빵천", True),  # across words, spaces dropped
+    ("대형 베이커리\n한옥 감성", "ㅎㅇ", True),  # any field
+    ("대형 베이커리\n한옥 감성", "ㄹㅎ", False),  # never across fields
+    ("Bakery 온", "bak", True),
+    ("Bakery 온", " ", False),
+])
+def test_prefix_matches(text, query, matches):
+    assert prefix_matches(text, query) is matches
+
+
+QUERIES = ["ㅅㄱㅃ", "ㄷㅇ", "ㅋㅍ", "속", "소금", "카페", "ㅎㅇㅋㅍ", "담양읍", "bak", "ㄱ", "ㅁ ㅇ"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_lookup_matches_scan(dataset, query):
+    texts = get_venue_store().search_index._prefix_texts
+    index = HangulPrefixIndex(texts)
+    expected = [row for row, text in enumerate(texts) if prefix_matches(text, query)]
+    assert index.lookup(query).tolist() == expected
+
+
+def test_lookup_beyond_key_length():
+    texts = ["대나무숲 한옥 카페 정원 뜰", "대나무숲 한옥 카페 정원", "대나무숲 한옥"]
+    index = HangulPrefixIndex(texts)
+    query = "대나무숲한옥카페정원뜰"
+    assert len(decompose(query)) > MAX_KEY_LENGTH
+    assert index.lookup(query).tolist() == [0]
+    assert index.lookup("ㄷㄴㅁㅅㅎㅇㅋㅍㅈㅇㄸ").tolist() == [0]
+    assert index.lookup("").dtype == np.int64
@@ -0,0 +1,64 @@
+"""Table of hours texts and the weeks parse_hours makes of them."""
+
+import pytest
+
+from utils.hours import parse_hours
+
+CLOSED = []
+
+
+def _at(hh_mm: str) -> int:
+    hour, minute = hh_mm.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _span(text: str) -> list:
+    """Intervals from "11:00-15:00 17:00-21:00" (a close past midnight goes past 24:00)."""
+    spans = []
+    for part in text.split():
+        start, end = (_at(t) for t in part.split("-"))
+        spans.append((start, end + 24 * 60 if end <= start else end))
+    return spans
+
+
+def _week(default: str, **days) -> list:
+    """Seven days of ``default`` intervals, with per-day overrides by Monday-first index (d0..d6)."""
+    return [days.get(f"d{day}", _span(default)) for day in range(7)]
+
+
+CASES = [
+    # Styles of the bundled data
+    ("10:00~18:00", _week("10:00-18:00")),
+    ("10:00~18:00(월 휴무)", _week("10:00-18:00", d0=CLOSED)),
+    ("09:00~19:30(일 휴무)", _week("09:00-19:30", d6=CLOSED)),
+    ("12:00~18:00(월,화 휴무)", _week("12:00-18:00", d0=CLOSED, d1=CLOSED)),
+    ("09:30~20:00, 연중무휴", _week("09:30-20:00")),
+    ("11:00~20:30(LO 20:00)", _week("11:00-20:00")),
+    ("11:00~21:00(BT 15~17시), 월 휴무", _week("11:00-15:00 17:00-21:00", d0=CLOSED)),
+    ("11:00~19:00(주말~20시), 수 휴무", _week("11:00-19:00", d2=CLOSED, d5=_span("11:00-20:00"), d6=_span("11:00-20:00"))),
+    # Styles of generated data
+    ("11:00~02:00", _week("11:00-02:00")),
+    ("10:30~21:00(LO 20:30), 목 휴무", _week("10:30-20:30", d3=CLOSED)),
+    # Day ranges and several ranges a day
+    ("화~일 11:00~20:00", _week("11:00-20:00", d0=CLOSED)),
+    ("금~월 10:00~18:00", _week("", d4=_span("10:00-18:00"), d5=_span("10:00-18:00"),
+                                d6=_span("10:00-18:00"), d0=_span("10:00-18:00"))),
+    ("11:00-15:00, 17:00-21:00", _week("11:00-15:00 17:00-21:00")),
+    ("11:00-15:00, 17:00-21:00 (LO 20:30)", _week("11:00-15:00 17:00-20:30")),
+    ("월~금 09:00-18:00, 토 10:00-15:00", _week("09:00-18:00", d5=_span("10:00-15:00"), d6=CLOSED)),
+    ("평일 11:00~21:00, 주말 10:00~22:00", _week("11:00-21:00", d5=_span("10:00-22:00"), d6=_span("10:00-22:00"))),
+    ("매주 월요일 휴무 10:00~18:00", _week("10:00-18:00", d0=CLOSED)),
+    # Unknown rather than guessed
+    ("", None),
+    (None, None),
+    ("영업시간 문의", None),
+    ("1,3째주 월 휴무 10:00~18:00", None),
+    ("10:00~18:00, 화 오전만", None),
+    ("25:00~27:00", None),
+    ("10:75~18:00", None),
+]
+
+
+@pytest.mark.parametrize("text, week", CASES)
+def test_parse_hours(text, week):
+    assert parse_hours(text) == week
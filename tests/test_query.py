@@ -0,0 +1,61 @@
+"""Indexed filter_venues against a linear scan of the same frame."""
+
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from utils.data_loader import filter_venues, get_venue_store
+from utils.query import bits_at, pack, unpack
+
+SEARCHES = ["소금빵", "카페", "국수", "ㅅㄱㅃ", "한옥 카페", "떡갈비", "책방", "zz"]
+DISTANCES = [1, 3, 5, 10, 20, 2.5, 7.3, 0.4]  # band radii and others
+
+
+def _random_filters(rng: random.Random, df) -> dict:
+    """One random combination of filter_venues criteria."""
+    categories = list(df["category"].cat.categories)
+    areas = list(df["area_name"].cat.categories)
+    filters = {}
+    if rng.random() < 0.5:
+        filters["categories"] = rng.sample(categories, rng.randint(1, len(categories)))
+    if rng.random() < 0.4:
+        filters["areas"] = rng.sample(areas, rng.randint(1, min(3, len(areas))))
+        if rng.random() < 0.2:
+            filters["areas"].append("없는 곳")
+    if rng.random() < 0.5:
+        filters["max_distance_km"] = rng.choice(DISTANCES)
+    if rng.random() < 0.4:
+        filters["search_query"] = rng.choice(SEARCHES)
+        filters["search_mode"] = rng.choice(["and", "or"])
+    if rng.random() < 0.3:
+        filters["open_at"] = datetime.datetime(2026, 10, rng.randint(12, 18), rng.randint(0, 23), rng.choice([0, 30]))
+        filters["open_for_min"] = rng.choice([0, 60])
+    return filters
+
+
+def test_indexed_matches_scan(dataset):
+    df = get_venue_store().df
+    copy = df.copy()  # not the store frame, so filter_venues scans it
+    rng = random.Random(0)
+    for _ in range(150):
+        filters = _random_filters(rng, df)
+        indexed = filter_venues(df, **filters)
+        scanned = filter_venues(copy, **filters)
+        assert indexed["id"].tolist() == scanned["id"].tolist(), filters
+
+
+def test_no_criteria_returns_every_row(dataset):
+    df = get_venue_store().df
+    assert len(filter_venues(df)) == len(df)
+    assert get_venue_store().query_engine.positions() is None
+
+
+@pytest.mark.parametrize("size", [0, 1, 7, 8, 9, 1000])
+def test_bitmaps(size):
+    mask = np.random.default_rng(size).random(size) < 0.3
+    bits = pack(mask)
+    assert np.array_equal(unpack(bits, size), mask)
+    positions = np.arange(size)
+    assert np.array_equal(bits_at(bits, positions), mask)
@@ -0,0 +1,116 @@
+"""Incremental reloads against a full rebuild of the same file."""
+
+import copy
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_loader import clear_store_cache, get_store_stats, get_venue_store
+
+QUERIES = ["카페", "소금빵", "수정됨", "새가게", "ㅅㄱㅃ", "ㅅㄱ", "속"]
+
+
+def _write(path, data):
+    """Write a dataset, moving its mtime forward so the change is always detected."""
+    stat = path.stat()
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _edit_feature(data):
+    data["venues"][3]["feature"] = "수정됨 카페"
+
+
+def _edit_category(data):
+    data["venues"][1]["category"] = "activity" if data["venues"][1]["category"] != "activity" else "cafe"
+
+
+def _insert_and_delete(data):
+    data["venues"].insert(2, dict(data["venues"][0], id=10**7, name="새가게 소금빵", category="activity"))
+    del data["venues"][10]
+
+
+def _reorder(data):
+    data["venues"].reverse()
+
+
+EDITS = {
+    "feature": _edit_feature,
+    "category": _edit_category,
+    "insert+delete": _insert_and_delete,
+    "reorder": _reorder,
+}
+
+
+@pytest.fixture
+def base(dataset):
+    """The dataset's JSON, loaded fresh; the file is restored afterwards."""
+    original = dataset.read_text(encoding="utf-8")
+    clear_store_cache()
+    get_venue_store()
+    yield json.loads(original)
+    dataset.write_text(original, encoding="utf-8")
+    clear_store_cache()
+
+
+def _assert_same_store(store, expected):
+    pd.testing.assert_frame_equal(store.df, expected.df)
+    for query in QUERIES:
+        for mode in ("and", "or"):
+            assert store.search_index.query(query, mode).tolist() == expected.search_index.query(query, mode).tolist()
+    for weekday in range(7):
+        for minute in range(0, 24 * 60, 90):
+            assert np.array_equal(store.hours_index.open_at(weekday, minute), expected.hours_index.open_at(weekday, minute))
+    for km in (1, 2.5, 10):
+        assert store.query_engine.positions(max_distance_km=km).tolist() == (
+            expected.query_engine.positions(max_distance_km=km).tolist()
+        )
+
+
+@pytest.mark.parametrize("edit", list(EDITS))
+def test_incremental_reload_matches_rebuild(dataset, base, edit):
+    before = get_venue_store()
+    before.search_index.prefix_index  # built indexes are carried over too
+    data = copy.deepcopy(base)
+    EDITS[edit](data)
+    _write(dataset, data)
+
+    incremental = get_store_stats()["incremental"]
+    store = get_venue_store()
+    assert get_store_stats()["incremental"] == incremental + 1
+    assert store.base_version == before.base_version and store.version != before.version
+
+    clear_store_cache()
+    _assert_same_store(store, get_venue_store())
+
+
+def test_reload_tags_only_touched_venues(dataset, base):
+    before = get_venue_store()
+    data = copy.deepcopy(base)
+    _edit_feature(data)
+    _write(dataset, data)
+    store = get_venue_store()
+
+    ids = store.df["id"].tolist()
+    changed = [i for i, old, new in zip(ids, before.venue_tags(ids), store.venue_tags(ids)) if old != new]
+    assert changed == [data["venues"][3]["id"]]
+    category = data["venues"][3]["category"]
+    others = [c for c in store.df["category"].unique() if c != category]
+    assert store.content_tag([category]) != before.content_tag([category])
+    assert store.content_tag(others) == before.content_tag(others)
+
+
+def test_accommodation_change_rebuilds(dataset, base):
+    before = get_venue_store()
+    data = copy.deepcopy(base)
+    data["accommodation"] = dict(data["accommodation"], lat=data["accommodation"]["lat"] + 0.01)
+    _write(dataset, data)
+
+    rebuilds = get_store_stats()["rebuilds"]
+    store = get_venue_store()
+    assert get_store_stats()["rebuilds"] == rebuilds + 1
+    assert store.base_version != before.base_version
+    assert not np.allclose(store.df["distance_km"], before.df["distance_km"])
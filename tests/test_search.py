@@ -0,0 +1,68 @@
+"""Search index lookups against a scan of the same venues."""
+
+import unicodedata
+
+import numpy as np
+import pytest
+
+from utils.data_loader import get_venue_store
+from utils.search import SearchIndex, normalize_text, search_mask, tokenize
+
+QUERIES = [
+    "카페",
+    "소금빵",
+    "빵",
+    "한옥 카페",
+    "담양",
+    "베이커리 주차",
+    "대나무숲 뷰",
+    "면앙정로",
+    "1300",
+    "LP",
+    "lp카페",
+    unicodedata.normalize("NFD", "소금빵"),  # decomposed input is composed first
+    "  죽녹원   ",
+    "ㅅㄱㅃ",  # chosung and jamo prefixes of name and feature words
+    "속 카페",
+    "ㄷㅇ",
+    "없는가게",
+    "zz",
+    "",
+]
+
+
+@pytest.mark.parametrize("mode", ["and", "or"])
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_scan(dataset, query, mode):
+    store = get_venue_store()
+    df, index = store.df, store.search_index
+    expected = np.flatnonzero(search_mask(df, query, mode).to_numpy())
+    assert index.query(query, mode).tolist() == expected.tolist()
+
+
+def test_query_ids(dataset):
+    store = get_venue_store()
+    df, index = store.df, store.search_index
+    assert index.query_ids("카페") == set(df["id"].to_numpy()[index.query("카페")].tolist())
+
+
+@pytest.mark.parametrize("text, normalized", [
+    ("  Cafe   ONE ", "cafe one"),
+    (unicodedata.normalize("NFD", "한옥"), "한옥"),
+    (None, ""),
+    (float("nan"), ""),
+    (42, "42"),
+])
+def test_normalize_text(text, normalized):
+    assert normalize_text(text) == normalized
+
+
+def test_from_arrays(dataset):
+    store = get_venue_store()
+    index = SearchIndex.from_arrays(store.df, store.search_index.to_arrays())
+    for query in QUERIES:
+        assert index.query(query).tolist() == store.search_index.query(query).tolist()
+
+
+def test_tokenize():
+    assert tokenize("소금빵 카페") == {"소", "금", "빵", "소금", "금빵", "카", "페", "카페"}
@@ -0,0 +1,150 @@
+"""Thread-safe LRU cache shared across Streamlit sessions."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss/eviction counters.
+
+    Entries are bounded by count (``maxsize``) and optionally by total size
+    (``maxbytes``, measured with ``sizeof``, ``len`` by default). With
+    ``ttl``, entries also expire that many seconds after they were stored.
+    ``get_or_create`` is single-flight: concurrent misses on a key share one
+    build.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        maxbytes: Optional[int] = None,
+        sizeof: Callable = len,
+        ttl: Optional[float] = None,
+        clock: Callable = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._expires = {}
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self._building = {}  # key -> lock held while its value is being built
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries and not self._expired(key)
+
+    def _expired(self, key: Hashable) -> bool:
+        """Drop the entry if its time is up (lock must be held)."""
+        if self.ttl is None or self._expires[key] > self._clock():
+            return False
+        self._remove(key)
+        self._stats["expirations"] += 1
+        return True
+
+    def get(self, key: Hashable, default=None):
+        """Get a cached value and mark it as most recently used."""
+        with self._lock:
+            if key in self._entries and not self._expired(key):
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+            return default
+
+    def put(self, key: Hashable, value) -> None:
+        """Store a value, evicting least recently used entries over the bounds.
+
+        A value larger than ``maxbytes`` on its own is not stored.
+        """
+        size = self._sizeof(value) if self.maxbytes is not None else 0
+        with self._lock:
+            self._remove(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            if self.ttl is not None:
+                self._expires[key] = self._clock() + self.ttl
+            self._nbytes += size
+            while len(self._entries) > self.maxsize or (
+                self.maxbytes is not None and self._nbytes > self.maxbytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop an entry and its size accounting (lock must be held)."""
+        if key in self._entries:
+            del self._entries[key]
+            self._nbytes -= self._sizes.pop(key)
+            self._expires.pop(key, None)
+
+    def get_or_create(self, key: Hashable, factory: Callable):
+        """Get a cached value, computing and storing it with ``factory()`` on a miss.
+
+        Threads missing on a key while another builds it wait for that build
+        and get its value. If the build raises or its value is not stored
+        (larger than ``maxbytes``), the next waiter builds it itself.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            with self._lock:
+                if key in self._entries and not self._expired(key):
+                    # Built by the thread this one waited for
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+            try:
+                value = factory()
+                self.put(key, value)
+            finally:
+                with self._lock:
+                    if self._building.get(key) is building:
+                        del self._building[key]
+        return value
+
+    def discard(self, predicate: Callable) -> int:
+        """Remove every entry whose key satisfies ``predicate``; returns the count."""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._nbytes = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction/expiration counters, the hit rate and the current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "nbytes": self._nbytes,
+                "maxbytes": self.maxbytes,
+                "ttl": self.ttl,
+            }
@@ -0,0 +1,126 @@
+"""Batched venue card rendering for the home and list pages."""
+
+import html
+from string import Template
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.data_loader import CATEGORY_INFO, get_venue_store
+from utils.routing import get_road_graph
+
+# Templates are compiled once; each card is a single line so a whole section
+# can go through one st.markdown call without markdown reinterpreting indents
+HOME_CARD = Template(
+    '<div class="venue-card">$link<div class="venue-name">$name</div>'
+    '<div class="venue-detail">$detail</div>$note</div>'
+)
+LIST_CARD = Template(
+    '<div class="venue-card">$link<span class="category-badge $badge_class">$badge</span>'
+    '<div class="venue-name">$name</div><div class="venue-detail">$feature</div>'
+    '<div class="venue-meta">$meta</div></div>'
+)
+HOME_LINK = Template('<a href="$url" target="_blank" class="venue-link">→</a>')
+LIST_LINK = Template('<a href="$url" target="_blank" class="venue-link">🔗</a>')
+NOTE_TAG = Template('<span class="venue-tag">💡 $note</span>')
+
+CARD_COLUMNS = ("id", "category", "name", "feature", "url", "hours", "note", "distance_km", "travel_min")
+
+BADGE_CLASSES = {"restaurant": "cat-restaurant", "cafe": "cat-cafe", "activity": "cat-activity"}
+
+_fragment_cache = LRUCache(maxsize=8192)
+
+
+def _text(value) -> str:
+    """HTML-escaped text for a cell, empty for missing values."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return html.escape(str(value))
+
+
+def _home_card(row: dict, show_hours: bool, show_note: bool) -> str:
+    """Render one home page card."""
+    url = _text(row.get("url"))
+    hours = _text(row.get("hours")) if show_hours else ""
+    note = _text(row.get("note")) if show_note else ""
+    return HOME_CARD.substitute(
+        link=HOME_LINK.substitute(url=url) if url else "",
+        name=_text(row["name"]),
+        detail=_text(row["feature"]) + (f" · {hours}" if hours else ""),
+        note=NOTE_TAG.substitute(note=note) if note else "",
+    )
+
+
+def _list_card(row: dict) -> str:
+    """Render one list page card."""
+    cat = row["category"]
+    cat_info = CATEGORY_INFO.get(cat, {"emoji": "", "label": cat})
+    url = _text(row.get("url"))
+    hours = _text(row.get("hours"))
+    note = _text(row.get("note"))
+    travel_min = row.get("travel_min")
+    meta_parts = [p for p in [
+        f"🕐 {hours}" if hours else "",
+        f"📍 {row['distance_km']:.1f}km",
+        f"🚗 {travel_min:.0f}분" if travel_min is not None and np.isfinite(travel_min) else "",
+        f"💡 {note}" if note else "",
+    ] if p]
+    return LIST_CARD.substitute(
+        link=LIST_LINK.substitute(url=url) if url else "",
+        badge_class=BADGE_CLASSES.get(cat, "cat-cafe"),
+        badge=f"{cat_info['emoji']} {html.escape(str(cat_info['label']))}",
+        name=_text(row["name"]),
+        feature=_text(row["feature"]),
+        meta=" · ".join(meta_parts),
+    )
+
+
+def _render_section(df: pd.DataFrame, variant: tuple, render, region: Optional[str] = None) -> str:
+    """Render all cards of a section, reusing cached fragments per venue.
+
+    Only venues without a cached fragment for their current revision are
+    converted to records and rendered, so a reload that edits a few venues
+    re-renders just those.
+    """
+    ids = df["id"].tolist()
+    keys = [(variant, venue_id, tag) for venue_id, tag in zip(ids, get_venue_store(region).venue_tags(ids))]
+    fragments = [_fragment_cache.get(key) for key in keys]
+    missing = [i for i, fragment in enumerate(fragments) if fragment is None]
+    if missing:
+        columns = [c for c in CARD_COLUMNS if c in df.columns]
+        for i, row in zip(missing, df[columns].iloc[missing].to_dict("records")):
+            fragments[i] = render(row)
+            _fragment_cache.put(keys[i], fragments[i])
+    return "".join(fragments)
+
+
+def render_home_cards(
+    df: pd.DataFrame,
+    show_hours: bool = False,
+    show_note: bool = True,
+    region: Optional[str] = None
+) -> str:
+    """Render a home page section's venue cards as one HTML block."""
+    return _render_section(
+        df, ("home", show_hours, show_note), lambda row: _home_card(row, show_hours, show_note), region
+    )
+
+
+def render_list_cards(df: pd.DataFrame, region: Optional[str] = None) -> str:
+    """Render list page venue cards (needs ``distance_km``) as one HTML block.
+
+    Road travel minutes are shown too when the frame has ``travel_min``;
+    fragments are then keyed by the road graph they came from.
+    """
+    travel = None
+    if "travel_min" in df.columns:
+        graph = get_road_graph(region)
+        travel = graph.digest if graph is not None else "estimate"
+    return _render_section(df, ("list", travel), _list_card, region)
+
+
+def get_card_cache_stats() -> dict:
+    """Get card fragment cache hit/miss/eviction counters."""
+    return _fragment_cache.stats()
@@ -0,0 +1,174 @@
+"""Region catalog: which venue datasets exist and where their files are.
+
+``data/catalog.json`` lists every region with its dataset file, bounding
+box, venue count and version, so a server can list regions without
+loading any of them::
+
+    {"default": "damyang",
+     "regions": {"damyang": {"name": "담양", "path": "venues.json", ...}}}
+
+Paths are relative to the catalog file, which ``DREAMTRIP_CATALOG`` can
+point elsewhere (benchmarks and load tests use throwaway catalogs).
+Refresh the derived fields after
+editing a dataset with ``python -m utils.catalog``, or register a new one
+with ``python -m utils.catalog add REGION_ID PATH NAME``.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+CATALOG_PATH = Path(os.environ.get("DREAMTRIP_CATALOG", Path(__file__).parent.parent / "data" / "catalog.json"))
+DEFAULT_DATASET = "venues.json"
+
+
+@dataclass(frozen=True)
+class Region:
+    """One catalog entry."""
+
+    id: str
+    name: str
+    path: Path
+    bbox: Optional[tuple] = None  # (min_lat, min_lng, max_lat, max_lng)
+    venue_count: Optional[int] = None
+    version: Optional[str] = None
+    roads: Optional[Path] = None
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Every known region plus the one used when none is selected."""
+
+    default: str
+    regions: dict
+
+    def resolve(self, region: Optional[str] = None) -> Region:
+        """Get a region by id (the default for None); unknown ids raise ValueError."""
+        region = region or self.default
+        if region not in self.regions:
+            raise ValueError(f"Unknown region: {region}")
+        return self.regions[region]
+
+
+_catalog = None
+_catalog_signature = None
+_catalog_lock = threading.Lock()
+
+
+def _parse_catalog(data: dict, root: Path) -> Catalog:
+    """Build a Catalog from its JSON shape."""
+    regions = {}
+    for region_id, entry in data["regions"].items():
+        regions[region_id] = Region(
+            id=region_id,
+            name=entry.get("name", region_id),
+            path=root / entry["path"],
+            bbox=tuple(entry["bbox"]) if entry.get("bbox") else None,
+            venue_count=entry.get("venue_count"),
+            version=entry.get("version"),
+            roads=root / entry["roads"] if entry.get("roads") else None,
+        )
+    return Catalog(default=data.get("default") or next(iter(regions)), regions=regions)
+
+
+def load_catalog(path: Path = CATALOG_PATH) -> Catalog:
+    """Get the region catalog, re-read only when the file changes.
+
+    Without a catalog file the single ``data/venues.json`` dataset is the
+    only (default) region.
+    """
+    global _catalog, _catalog_signature
+
+    signature = (path.stat().st_mtime_ns, path.stat().st_size) if path.exists() else None
+    with _catalog_lock:
+        if _catalog is None or signature != _catalog_signature:
+            if signature is None:
+                _catalog = Catalog(
+                    default="default",
+                    regions={"default": Region(id="default", name="default", path=path.parent / DEFAULT_DATASET)},
+                )
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    _catalog = _parse_catalog(json.load(f), path.parent)
+            _catalog_signature = signature
+        return _catalog
+
+
+def resolve_region(query_params, session_state) -> Optional[str]:
+    """Pick a page's region and remember it for the next page.
+
+    The region comes from the URL (``?region=...``), else the one carried
+    over from the previous page in session state, else None for the
+    catalog default. Unknown ids fall back to the default. The result is
+    written back to both, so switching pages keeps it and the URL stays
+    shareable.
+    """
+    region = query_params.get("region") or session_state.get("region")
+    if region not in load_catalog().regions:
+        region = None
+    session_state["region"] = region
+    if region is not None and query_params.get("region") != region:
+        query_params["region"] = region
+    return region
+
+
+def describe_dataset(source: Path) -> dict:
+    """Compute a dataset's catalog fields: bounding box, venue count and version."""
+    from utils.data_loader import compute_coords
+
+    raw = source.read_bytes()
+    data = json.loads(raw.decode("utf-8"))
+    venues = data["venues"]
+    lats, lngs, _ = compute_coords(
+        [v["name"] for v in venues], [v.get("area") or "eup" for v in venues], data["areas"]
+    )
+    lats = list(lats) + [data["accommodation"]["lat"]]
+    lngs = list(lngs) + [data["accommodation"]["lng"]]
+    return {
+        "bbox": [round(min(lats), 6), round(min(lngs), 6), round(max(lats), 6), round(max(lngs), 6)],
+        "venue_count": len(venues),
+        "version": hashlib.sha256(raw).hexdigest()[:12],
+    }
+
+
+def write_catalog(data: dict, target: Path = CATALOG_PATH) -> Path:
+    """Write the catalog JSON atomically."""
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    tmp.replace(target)
+    return target
+
+
+def refresh_catalog(target: Path = CATALOG_PATH) -> Path:
+    """Recompute the derived fields of every region in the catalog file."""
+    with open(target, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for entry in data["regions"].values():
+        entry.update(describe_dataset(target.parent / entry["path"]))
+    return write_catalog(data, target)
+
+
+def add_region(region_id: str, path: str, name: str, target: Path = CATALOG_PATH) -> Path:
+    """Register a dataset file (relative to the catalog) as a region."""
+    data = {"default": region_id, "regions": {}}
+    if target.exists():
+        with open(target, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    data["regions"][region_id] = {"name": name, "path": path, **describe_dataset(target.parent / path)}
+    return write_catalog(data, target)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "add":
+        print(f"Wrote {add_region(*sys.argv[2:])}")
+    elif len(sys.argv) == 1:
+        print(f"Wrote {refresh_catalog()}")
+    else:
+        sys.exit("usage: python -m utils.catalog [add REGION_ID PATH NAME]")
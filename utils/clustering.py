@@ -0,0 +1,56 @@
+"""Server-side grid clustering of venues per map zoom level."""
+
+import numpy as np
+
+TILE_SIZE = 256  # Web Mercator tile size in pixels
+
+
+def mercator_pixels(lats, lngs, zoom: int) -> tuple:
+    """Project degrees to Web Mercator pixel coordinates at ``zoom``."""
+    world = TILE_SIZE * (2 ** zoom)
+    lat_rad = np.radians(np.clip(np.asarray(lats, dtype=np.float64), -85.05112878, 85.05112878))
+    x = (np.asarray(lngs, dtype=np.float64) + 180.0) / 360.0 * world
+    y = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * world
+    return x, y
+
+
+class ClusterPyramid:
+    """Grid cluster assignment of every venue for a range of zoom levels.
+
+    At each zoom, points falling in the same ``cell_px`` screen-pixel square
+    share a cluster label. Labels are computed once for the whole dataset;
+    any filtered subset is clustered by regrouping its labels.
+    """
+
+    def __init__(self, lats, lngs, min_zoom: int = 8, max_zoom: int = 15, cell_px: int = 60):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.cell_px = cell_px
+        self._labels = {}
+        for zoom in range(min_zoom, max_zoom + 1):
+            x, y = mercator_pixels(self.lats, self.lngs, zoom)
+            cx = np.floor(x / cell_px).astype(np.int64)
+            cy = np.floor(y / cell_px).astype(np.int64)
+            keys = cx * (TILE_SIZE * 2 ** zoom // cell_px + 1) + cy
+            self._labels[zoom] = np.unique(keys, return_inverse=True)[1].ravel()
+
+    def clusters(self, zoom: int, positions=None) -> dict:
+        """Get the clusters of a subset of rows at ``zoom``.
+
+        Returns arrays ``lat``/``lng`` (centroids), ``count`` and ``position``
+        (a member row, i.e. the venue itself for single-venue clusters).
+        """
+        zoom = min(max(zoom, self.min_zoom), self.max_zoom)
+        positions = np.arange(len(self.lats)) if positions is None else np.asarray(positions)
+        labels = self._labels[zoom][positions]
+        unique, first, inverse, counts = np.unique(
+            labels, return_index=True, return_inverse=True, return_counts=True
+        )
+        return {
+            "lat": np.bincount(inverse, weights=self.lats[positions], minlength=len(unique)) / counts,
+            "lng": np.bincount(inverse, weights=self.lngs[positions], minlength=len(unique)) / counts,
+            "count": counts,
+            "position": positions[first],
+        }
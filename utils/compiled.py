@@ -0,0 +1,183 @@
+"""Compiled columnar venue dataset (Arrow IPC) with memory-mapped loading.
+
+Build the artifact next to the JSON source with::
+
+    python -m utils.compiled
+
+The artifact is an uncompressed Arrow IPC file, so numeric columns are
+read zero-copy from the page cache and every worker process mapping it
+shares the same physical pages. Prebuilt query indexes (search postings,
+hours codes) go in a ``.index.arrow`` file beside it, so loading skips
+tokenizing every venue.
+"""
+
+import json
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+
+FORMAT_VERSION = 3  # 2: compact dtypes (dictionary-encoded labels, float32 coordinates); 3: index file
+METADATA_KEY = b"dreamtrip"
+
+
+class CompiledDataset(NamedTuple):
+    """Venue frame and side tables read from a compiled artifact."""
+
+    df: pd.DataFrame
+    accommodation: dict
+    areas: dict
+    content_hash: str
+    indexes: Optional[dict] = None  # index name -> {array name: array or list}
+
+
+def compiled_path(source: Path) -> Path:
+    """Get the artifact path for a JSON source (``venues.json`` -> ``venues.arrow``)."""
+    return source.with_suffix(".arrow")
+
+
+def index_path(target: Path) -> Path:
+    """Get the index file beside an artifact (``venues.arrow`` -> ``venues.index.arrow``)."""
+    return target.with_suffix(".index.arrow")
+
+
+def _write_ipc(table: "pa.Table", target: Path) -> None:
+    """Write a table as an Arrow IPC file beside the target, then rename it into place.
+
+    Readers never map a partial file.
+    """
+    partial = target.with_suffix(target.suffix + ".tmp")
+    with pa.OSFile(str(partial), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    partial.replace(target)
+
+
+def _write_indexes(indexes: dict, content_hash: str, target: Path) -> None:
+    """Write index arrays of any lengths as a one-row table of list columns."""
+    columns = {}
+    for name, arrays in indexes.items():
+        for key, values in arrays.items():
+            if isinstance(values, np.ndarray):
+                flat = pa.array(values)
+            else:
+                flat = pa.array([v if isinstance(v, str) else None for v in values], type=pa.string())
+            columns[f"{name}.{key}"] = pa.ListArray.from_arrays(pa.array([0, len(flat)], type=pa.int32()), flat)
+    metadata = {"format_version": FORMAT_VERSION, "content_hash": content_hash}
+    table = pa.table(columns).replace_schema_metadata({
+        METADATA_KEY: json.dumps(metadata).encode("utf-8"),
+    })
+    _write_ipc(table, target)
+
+
+def _read_indexes(target: Path, content_hash: str) -> Optional[dict]:
+    """Map an index file written for the same content; None when missing or stale.
+
+    Numeric arrays are zero-copy views of the mapped file.
+    """
+    if not target.exists():
+        return None
+    try:
+        reader = ipc.open_file(pa.memory_map(str(target), "r"))
+        metadata = json.loads(reader.schema.metadata[METADATA_KEY].decode("utf-8"))
+        if metadata.get("format_version") != FORMAT_VERSION or metadata.get("content_hash") != content_hash:
+            return None
+        table = reader.read_all()
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowInvalid):
+        return None
+
+    indexes = {}
+    for column_name, column in zip(table.column_names, table.columns):
+        name, key = column_name.split(".", 1)
+        flat = column.chunk(0).values
+        if pa.types.is_string(flat.type):
+            indexes.setdefault(name, {})[key] = flat.to_pylist()
+        else:
+            indexes.setdefault(name, {})[key] = flat.to_numpy(zero_copy_only=False)
+    return indexes
+
+
+def write_compiled(
+    df: pd.DataFrame,
+    accommodation: dict,
+    areas: dict,
+    signature: tuple,
+    content_hash: str,
+    target: Path,
+    indexes: Optional[dict] = None
+) -> Path:
+    """Write the venue frame and its source fingerprint as an Arrow IPC file.
+
+    ``indexes`` ({index name: {array name: numpy array or list of strings}})
+    go to the index file beside it.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to compile the venue dataset")
+
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "signature": list(signature),
+        "content_hash": content_hash,
+        "accommodation": accommodation,
+        "areas": areas,
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        METADATA_KEY: json.dumps(metadata, ensure_ascii=False).encode("utf-8"),
+    })
+
+    if indexes:
+        _write_indexes(indexes, content_hash, index_path(target))
+    _write_ipc(table, target)
+    return target
+
+
+def read_compiled(
+    target: Path,
+    signature: tuple,
+    content_hash: Optional[str] = None
+) -> Optional[CompiledDataset]:
+    """Memory-map a compiled artifact if it matches the source.
+
+    The artifact is fresh when it records the source's current (mtime, size)
+    signature or, failing that, its content hash. Returns None when the
+    artifact is missing, stale or unreadable so callers fall back to JSON.
+    """
+    if pa is None or not target.exists():
+        return None
+    try:
+        reader = ipc.open_file(pa.memory_map(str(target), "r"))
+        metadata = json.loads(reader.schema.metadata[METADATA_KEY].decode("utf-8"))
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowInvalid):
+        return None
+
+    if metadata.get("format_version") != FORMAT_VERSION:
+        return None
+    fresh = tuple(metadata["signature"]) == tuple(signature) or (
+        content_hash is not None and metadata["content_hash"] == content_hash
+    )
+    if not fresh:
+        return None
+
+    df = reader.read_all().to_pandas(split_blocks=True)
+    return CompiledDataset(
+        df=df,
+        accommodation=metadata["accommodation"],
+        areas=metadata["areas"],
+        content_hash=metadata["content_hash"],
+        indexes=_read_indexes(index_path(target), metadata["content_hash"]),
+    )
+
+
+if __name__ == "__main__":
+    from utils.data_loader import compile_dataset
+
+    print(f"Compiled {compile_dataset()}")
@@ -1,63 +1,512 @@
 """Data loader for Damyang retreat venues."""
 
+import datetime
+import hashlib
 import json
 import math
+import threading
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+import numpy as np
 import pandas as pd
 
+from utils.cache import LRUCache
+from utils.catalog import Region, load_catalog
+from utils.compiled import compiled_path, read_compiled, write_compiled
+from utils.hours import HoursIndex, weekday_minute
+from utils.search import SearchIndex, normalize_text, search_mask
+from utils.tracing import traced
+
+if TYPE_CHECKING:
+    from utils.query import QueryEngine
+    from utils.spatial import SpatialIndex
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "venues.json"
+MAX_LOADED_REGIONS = 8
+INCREMENTAL_MAX_CHANGES = 0.25  # changed fraction above which a reload rebuilds everything
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_BYTES = 128 * 1024 * 1024
+RESULT_CACHE_TTL = 600  # seconds
+
+
+# Columns added to the JSON venue records by _build_venues_df
+DERIVED_COLUMNS = ("lat", "lng", "area_name", "distance_km")
+
+# Store frame dtypes: low-cardinality labels as categoricals, free text as
+# Arrow-backed strings, coordinates and distances as float32 (~1 m)
+CATEGORICAL_COLUMNS = ("category", "area", "area_name", "subcategory")
+TEXT_COLUMNS = ("name", "feature", "address", "url", "hours", "note")
+FLOAT32_COLUMNS = ("lat", "lng", "distance_km")
+try:
+    TEXT_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)  # pandas' default "str" since 3.0
+except ImportError:  # no pyarrow (it ships with streamlit)
+    TEXT_DTYPE = object
+
+
+def enable_copy_on_write() -> None:
+    """Turn on pandas copy-on-write for the app process (always on since pandas 3).
+
+    filter_venues hands out shallow slices of the shared store frame and
+    of cached results; copy-on-write keeps a session's in-place edits from
+    reaching them. Entry scripts call this at startup rather than the
+    module on import, so importing utils leaves other callers' pandas
+    settings alone.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+@dataclass(frozen=True)
+class VenueStore:
+    """Parsed venue dataset shared read-only by every session in the process."""
+
+    df: pd.DataFrame
+    accommodation: dict
+    areas: dict
+    spatial_index: "SpatialIndex"
+    search_index: SearchIndex
+    hours_index: HoursIndex
+    query_engine: "QueryEngine"
+    signature: tuple
+    content_hash: str
+    region: str = "default"
+    base_version: str = ""  # version of the last full build
+    revisions: dict = field(default_factory=dict, repr=False)  # venue id -> edits since then
+    category_revisions: dict = field(default_factory=dict)  # category -> edits since then
+    raw_data: Optional[dict] = field(default=None, repr=False)
+
+    @property
+    def version(self) -> str:
+        """Short dataset version derived from the file contents."""
+        return self.content_hash[:12]
+
+    def venue_tags(self, ids) -> list:
+        """Cache tags per venue id; a venue's tag survives reloads that did not touch it."""
+        return [(self.base_version, self.revisions.get(venue_id, 0)) for venue_id in ids]
+
+    def content_tag(self, categories=None) -> tuple:
+        """Cache tag for the venues of ``categories`` (all when empty).
+
+        Unlike ``version``, it only changes when a reload touches those categories.
+        """
+        selected = categories if categories else self.category_revisions
+        return (self.base_version, sum(self.category_revisions.get(cat, 0) for cat in selected))
+
+    @property
+    def data(self) -> dict:
+        """The dataset in its JSON shape (rebuilt once when loaded from an artifact)."""
+        if self.raw_data is None:
+            columns = [c for c in self.df.columns if c not in DERIVED_COLUMNS]
+            venues = [
+                {k: v for k, v in record.items() if not (v is None or (np.isscalar(v) and pd.isna(v)))}
+                for record in self.df[columns].to_dict("records")
+            ]
+            raw_data = {"accommodation": self.accommodation, "areas": self.areas, "venues": venues}
+            object.__setattr__(self, "raw_data", raw_data)
+        return self.raw_data
+
+
+# Loaded regions, least recently used evicted first; builds are serialized
+_stores = LRUCache(maxsize=MAX_LOADED_REGIONS)
+_store_lock = threading.Lock()
+_store_stats = {"hits": 0, "misses": 0, "rebuilds": 0, "incremental": 0}
+
+# filter_venues results on store frames, shared by every session
+_result_cache = LRUCache(
+    maxsize=RESULT_CACHE_SIZE,
+    maxbytes=RESULT_CACHE_BYTES,
+    sizeof=lambda frame: int(frame.memory_usage(deep=True).sum()),
+    ttl=RESULT_CACHE_TTL,
+)
+
+
+def _file_signature(path: Path) -> tuple:
+    """Cheap change detector for the data file: (mtime_ns, size)."""
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+COORD_SPREAD = 0.003  # degrees of jitter around the area center
+
+
+def js_string_hashes(names) -> np.ndarray:
+    """Compute the JS ``getCoords`` string hash for many names at once.
+
+    Equivalent to ``hash = s.charCodeAt(i) + ((hash << 5) - hash); hash |= 0``
+    over UTF-16 code units, i.e. ``sum(c_i * 31**(L-1-i))`` wrapped to a
+    signed 32-bit integer. Horner's rule runs over character positions
+    rather than names: step ``k`` folds the ``k``-th code unit of every name
+    longer than ``k`` into its hash. Names are visited longest first, so
+    those still hashing are a prefix; memory stays O(count) and the work is
+    the total number of code units, whatever the longest name.
+    """
+    names = [name if isinstance(name, str) else str(name) for name in names]
+    count = len(names)
+    if count == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    units = np.frombuffer("".join(names).encode("utf-16-le"), dtype="<u2")
+    lengths = np.fromiter(map(len, names), dtype=np.int64, count=count)
+    if units.size != lengths.sum():
+        # Astral characters take two UTF-16 code units (surrogate pairs)
+        lengths = np.fromiter(
+            (len(name.encode("utf-16-le")) // 2 for name in names), dtype=np.int64, count=count
+        )
+    starts = np.cumsum(lengths) - lengths
+
+    order = np.argsort(-lengths, kind="stable")
+    starts = starts[order]
+    remaining = np.searchsorted(-lengths[order], -np.arange(int(lengths.max())), side="left")
+    hashes = np.zeros(count, dtype=np.uint64)
+    for k, active in enumerate(remaining):
+        # uint64 arithmetic masked to 32 bits each step, as JS's "|= 0"
+        hashes[:active] = (hashes[:active] * np.uint64(31) + units[starts[:active] + k]) & np.uint64(0xFFFFFFFF)
+
+    result = np.empty(count, dtype=np.uint32)
+    result[order] = hashes
+    return result.view(np.int32)
+
+
+def compute_coords(names, area_keys, areas: dict) -> tuple:
+    """Compute (lat, lng, area_name) arrays for venues (mimics original JS getCoords)."""
+    fallback = areas["eup"]
+    resolved = [areas.get(key, fallback) for key in area_keys]
+    area_lat = np.fromiter((a["lat"] for a in resolved), dtype=np.float64, count=len(resolved))
+    area_lng = np.fromiter((a["lng"] for a in resolved), dtype=np.float64, count=len(resolved))
+
+    hashes = js_string_hashes(names).astype(np.float64)
+    rand1 = (np.sin(hashes) + 1) / 2
+    rand2 = (np.cos(hashes) + 1) / 2
+
+    lats = area_lat + (rand1 - 0.5) * COORD_SPREAD
+    lngs = area_lng + (rand2 - 0.5) * COORD_SPREAD
+    area_names = np.array([a["name"] for a in resolved], dtype=object)
+    return lats, lngs, area_names
+
+
+def _derive_columns(df: pd.DataFrame, data: dict) -> tuple:
+    """Compute (lat, lng, area_name, distance_km) arrays for venue rows."""
+    area_keys = df["area"].fillna("eup") if "area" in df else ["eup"] * len(df)
+    lats, lngs, area_names = compute_coords(df["name"], area_keys, data["areas"])
+    accommodation = data["accommodation"]
+    return lats, lngs, area_names, distances_from(accommodation["lat"], accommodation["lng"], lats, lngs)
+
+
+def compact_venues_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a venue frame to the compact store dtypes; other columns are left alone."""
+    dtypes = {column: "category" for column in CATEGORICAL_COLUMNS if column in df}
+    dtypes.update({column: TEXT_DTYPE for column in TEXT_COLUMNS if column in df})
+    dtypes.update({column: np.float32 for column in FLOAT32_COLUMNS if column in df})
+    return df.astype(dtypes)
+
+
+def memory_footprint(df: pd.DataFrame) -> dict:
+    """Get a frame's memory use: bytes per column, total, and MB per 100k rows."""
+    columns = df.memory_usage(index=False, deep=True)
+    total = int(columns.sum())
+    return {
+        "columns": {column: int(size) for column, size in columns.items()},
+        "total_bytes": total,
+        "mb_per_100k": round(total / max(len(df), 1) * 100_000 / 2**20, 2),
+    }
+
+
+def _build_venues_df(data: dict) -> pd.DataFrame:
+    """Build the compact venue DataFrame with computed coordinates and base camp distance."""
+    df = pd.DataFrame(data["venues"])
+    for column, values in zip(DERIVED_COLUMNS, _derive_columns(df, data)):
+        df[column] = values
+    return compact_venues_df(df)
+
+
+def _make_store(
+    df: pd.DataFrame,
+    accommodation: dict,
+    areas: dict,
+    signature: tuple,
+    content_hash: str,
+    region: str = "default",
+    raw_data: Optional[dict] = None,
+    search_index: Optional[SearchIndex] = None,
+    hours_index: Optional[HoursIndex] = None
+) -> VenueStore:
+    """Build the query indexes for a venue frame (unless given) and wrap everything in a store."""
+    from utils.query import QueryEngine
+    from utils.spatial import SpatialIndex
+
+    search_index = search_index if search_index is not None else SearchIndex(df)
+    if hours_index is None:
+        hours_index = HoursIndex(df["hours"] if "hours" in df else [""] * len(df))
+    return VenueStore(
+        df=df,
+        accommodation=accommodation,
+        areas=areas,
+        spatial_index=SpatialIndex(df["lat"], df["lng"], categories=df["category"]),
+        search_index=search_index,
+        hours_index=hours_index,
+        query_engine=QueryEngine(
+            df, (accommodation["lat"], accommodation["lng"]), search_index, hours_index
+        ),
+        signature=signature,
+        content_hash=content_hash,
+        region=region,
+        base_version=content_hash[:12],
+        raw_data=raw_data,
+    )
+
+
+@traced
+def _build_store(raw: bytes, signature: tuple, content_hash: str, region: str) -> VenueStore:
+    """Parse the raw JSON bytes and derive every shared structure."""
+    data = json.loads(raw.decode("utf-8"))
+    df = _build_venues_df(data)
+    return _make_store(
+        df, data["accommodation"], data["areas"], signature, content_hash, region, raw_data=data
+    )
+
+
+def _diff_venues(old: list, new: list) -> Optional[tuple]:
+    """Split venue ids into (inserted, updated, deleted) sets.
+
+    Returns None when ids are missing or repeated, so no diff is possible.
+    """
+    old_by_id = {venue.get("id"): venue for venue in old}
+    new_by_id = {venue.get("id"): venue for venue in new}
+    if None in old_by_id or None in new_by_id or len(old_by_id) < len(old) or len(new_by_id) < len(new):
+        return None
+    inserted = new_by_id.keys() - old_by_id.keys()
+    deleted = old_by_id.keys() - new_by_id.keys()
+    updated = {
+        venue_id for venue_id, venue in new_by_id.items()
+        if venue_id in old_by_id and old_by_id[venue_id] != venue
+    }
+    return inserted, updated, deleted
+
+
+@traced
+def _reload_store(store: VenueStore, raw: bytes, signature: tuple, content_hash: str) -> Optional[VenueStore]:
+    """Apply a changed file to a loaded store by diffing venues on ``id``.
+
+    Only inserted and updated venues get coordinates, distances and search
+    entries computed; unchanged rows reuse the loaded values. The changed
+    venues and their categories get their revisions bumped, so caches keyed
+    by ``venue_tags``/``content_tag`` drop only what changed. Returns None
+    when a full rebuild is needed (accommodation or areas changed, ids not
+    diffable, or too many changes).
+    """
+    data = json.loads(raw.decode("utf-8"))
+    old = store.data
+    if data["accommodation"] != old["accommodation"] or data["areas"] != old["areas"]:
+        return None
+    diff = _diff_venues(old["venues"], data["venues"])
+    if diff is None:
+        return None
+    inserted, updated, deleted = diff
+    if len(inserted) + len(updated) + len(deleted) > INCREMENTAL_MAX_CHANGES * max(len(data["venues"]), 1):
+        return None
+
+    df = pd.DataFrame(data["venues"])
+    ids = df["id"].to_numpy()
+    sources = pd.Index(store.df["id"]).get_indexer(ids)
+    changed = np.isin(ids, list(inserted | updated))
+    rows = np.flatnonzero(changed)
+    derived = _derive_columns(df.iloc[rows], data)
+    kept = np.flatnonzero(~changed)
+    for column, values in zip(DERIVED_COLUMNS, derived):
+        # Unchanged rows take the loaded value, changed rows the fresh one
+        column_values = np.empty(len(df), dtype=np.asarray(values).dtype)
+        column_values[kept] = store.df[column].to_numpy()[sources[kept]]
+        column_values[rows] = values
+        df[column] = column_values
+
+    touched_ids = inserted | updated | deleted
+    revisions = dict(store.revisions)
+    for venue_id in touched_ids:
+        revisions[venue_id] = revisions.get(venue_id, 0) + 1
+    old_categories = store.df.set_index("id")["category"]
+    touched_categories = set(df.loc[changed, "category"]) | {
+        old_categories[venue_id] for venue_id in (updated | deleted)
+    }
+    category_revisions = dict(store.category_revisions)
+    for cat in touched_categories:
+        category_revisions[cat] = category_revisions.get(cat, 0) + 1
+
+    loaded = _make_store(
+        compact_venues_df(df), data["accommodation"], data["areas"], signature, content_hash, store.region,
+        raw_data=data, search_index=store.search_index.updated(df, sources, changed),
+    )
+    return replace(
+        loaded,
+        base_version=store.base_version,
+        revisions=revisions,
+        category_revisions=category_revisions,
+    )
+
+
+@traced
+def _load_compiled_store(
+    entry: Region,
+    signature: tuple,
+    content_hash: Optional[str] = None
+) -> Optional[VenueStore]:
+    """Load a region's store from its compiled artifact if it is fresh."""
+    compiled = read_compiled(compiled_path(entry.path), signature, content_hash)
+    if compiled is None:
+        return None
+    search_index = hours_index = None
+    if compiled.indexes is not None:
+        search_index = SearchIndex.from_arrays(compiled.df, compiled.indexes["search"])
+        hours_index = HoursIndex(codes=compiled.indexes["hours"]["codes"], texts=compiled.indexes["hours"]["texts"])
+    return _make_store(
+        compiled.df, compiled.accommodation, compiled.areas, signature, compiled.content_hash, entry.id,
+        search_index=search_index, hours_index=hours_index,
+    )
+
+
+@traced
+def get_venue_store(region: Optional[str] = None) -> VenueStore:
+    """Get the process-wide venue store of a region (the catalog default for None).
+
+    Regions are loaded on first use and kept in an LRU of
+    ``MAX_LOADED_REGIONS`` stores. A region's file is re-read only when its
+    mtime or size differs from the loaded snapshot, and re-parsed only when
+    its content hash differs as well; edits to a loaded region are then
+    applied incrementally when possible (see ``_reload_store``). A fresh
+    compiled artifact (see ``compile_dataset``) is memory-mapped instead of
+    parsing the JSON.
+    """
+    entry = load_catalog().resolve(region)
+    signature = _file_signature(entry.path)
+    store = _stores.get(entry.id)
+    if store is not None and store.signature == signature:
+        _store_stats["hits"] += 1
+        return store
+
+    with _store_lock:
+        store = _stores.get(entry.id)
+        if store is not None and store.signature == signature:
+            _store_stats["hits"] += 1
+            return store
+
+        _store_stats["misses"] += 1
+        loaded = _load_compiled_store(entry, signature) if store is None else None
+        if loaded is None:
+            raw = entry.path.read_bytes()
+            content_hash = hashlib.sha256(raw).hexdigest()
+            if store is not None and store.content_hash == content_hash:
+                # Touched but unchanged: keep the parsed objects
+                loaded = replace(store, signature=signature)
+            else:
+                # Diff against the loaded snapshot before falling back to a full build
+                loaded = _reload_store(store, raw, signature, content_hash) if store is not None else None
+                if loaded is not None:
+                    _store_stats["incremental"] += 1
+                else:
+                    loaded = _load_compiled_store(entry, signature, content_hash)
+                    if loaded is None:
+                        loaded = _build_store(raw, signature, content_hash, entry.id)
+                    _store_stats["rebuilds"] += 1
+        else:
+            _store_stats["rebuilds"] += 1
+        _stores.put(entry.id, loaded)
+        if store is not None and store.version != loaded.version:
+            _result_cache.discard(lambda key: key[0] == entry.id and key[1] != loaded.version)
+        return loaded
+
+
+def compile_dataset(source: Path = DATA_PATH) -> Path:
+    """Compile the JSON dataset, including derived columns and search/hours indexes, into an Arrow artifact."""
+    raw = source.read_bytes()
+    data = json.loads(raw.decode("utf-8"))
+    df = _build_venues_df(data)
+    hours_index = HoursIndex(df["hours"] if "hours" in df else [""] * len(df))
+    return write_compiled(
+        df,
+        data["accommodation"],
+        data["areas"],
+        _file_signature(source),
+        hashlib.sha256(raw).hexdigest(),
+        compiled_path(source),
+        indexes={
+            "search": SearchIndex(df).to_arrays(),
+            "hours": {"codes": hours_index.codes, "texts": hours_index.texts},
+        },
+    )
+
+
+def clear_store_cache(region: Optional[str] = None) -> None:
+    """Drop loaded stores (one region, or all for None) so the next access reloads from disk."""
+    if region is None:
+        _stores.clear()
+    else:
+        entry = load_catalog().resolve(region)
+        _stores.discard(lambda cached: cached == entry.id)
+
+
+def clear_result_cache() -> None:
+    """Drop every cached filter_venues result."""
+    _result_cache.clear()
+
+
+def get_result_cache_stats() -> dict:
+    """Get filter result cache hit/miss/eviction/expiration counters and hit rate."""
+    return _result_cache.stats()
+
+
+def get_store_stats() -> dict:
+    """Get venue store hit/miss/rebuild counters and the loaded regions."""
+    with _store_lock:
+        return {**_store_stats, "loaded_regions": len(_stores)}
+
+
+def get_regions() -> dict:
+    """Get the catalog's regions by id, without loading any of them."""
+    return load_catalog().regions
+
+
+def load_venues(region: Optional[str] = None) -> dict:
+    """Load venues data (shared, treat as read-only)."""
+    return get_venue_store(region).data
+
+
+def get_venues_df(region: Optional[str] = None) -> pd.DataFrame:
+    """Get venues as a pandas DataFrame with computed coordinates (shared, treat as read-only)."""
+    return get_venue_store(region).df
+
+
+def get_accommodation(region: Optional[str] = None) -> dict:
+    """Get accommodation details."""
+    return get_venue_store(region).accommodation
 
-def load_venues() -> dict:
-    """Load venues data from JSON file."""
-    data_path = Path(__file__).parent.parent / "data" / "venues.json"
-    with open(data_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def get_venues_df() -> pd.DataFrame:
-    """Get venues as a pandas DataFrame with computed coordinates."""
-    data = load_venues()
-    venues = data["venues"]
-    areas = data["areas"]
 
-    # Calculate coordinates based on area and name hash (matching original JS logic)
-    for venue in venues:
-        area_key = venue.get("area", "eup")
-        area = areas.get(area_key, areas["eup"])
+def get_areas(region: Optional[str] = None) -> dict:
+    """Get area definitions."""
+    return get_venue_store(region).areas
 
-        # Hash-based coordinate offset (mimics original JS getCoords)
-        name = venue["name"]
-        hash_val = 0
-        for char in name:
-            hash_val = ord(char) + ((hash_val << 5) - hash_val)
 
-        rand1 = (math.sin(hash_val) + 1) / 2
-        rand2 = (math.cos(hash_val) + 1) / 2
-        spread = 0.003
+def get_spatial_index(region: Optional[str] = None) -> "SpatialIndex":
+    """Get the spatial index over the rows of ``get_venues_df()``."""
+    return get_venue_store(region).spatial_index
 
-        venue["lat"] = area["lat"] + (rand1 - 0.5) * spread
-        venue["lng"] = area["lng"] + (rand2 - 0.5) * spread
-        venue["area_name"] = area["name"]
 
-    return pd.DataFrame(venues)
+def get_search_index(region: Optional[str] = None) -> SearchIndex:
+    """Get the full-text search index over the rows of ``get_venues_df()``."""
+    return get_venue_store(region).search_index
 
 
-def get_accommodation() -> dict:
-    """Get accommodation details."""
-    data = load_venues()
-    return data["accommodation"]
+def get_hours_index(region: Optional[str] = None) -> HoursIndex:
+    """Get the opening-hours index over the rows of ``get_venues_df()``."""
+    return get_venue_store(region).hours_index
 
 
-def get_areas() -> dict:
-    """Get area definitions."""
-    data = load_venues()
-    return data["areas"]
+EARTH_RADIUS_KM = 6371
 
 
 def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """Calculate distance between two points in kilometers using Haversine formula."""
-    R = 6371  # Earth's radius in km
+    R = EARTH_RADIUS_KM
 
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
@@ -71,42 +520,177 @@ def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     return R * c
 
 
+def _haversine(lat1, lng1, lat2, lng2):
+    """Haversine kernel on radian arrays (broadcasting), returns km."""
+    sin_dlat = np.sin((lat2 - lat1) / 2)
+    sin_dlng = np.sin((lng2 - lng1) / 2)
+    a = sin_dlat * sin_dlat + np.cos(lat1) * np.cos(lat2) * sin_dlng * sin_dlng
+    return (2 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def distances_from(lat: float, lng: float, lats, lngs, dtype=np.float64) -> np.ndarray:
+    """Calculate distances in km from one point to many points.
+
+    ``dtype`` may be ``np.float32`` to halve memory traffic at ~1m precision.
+    """
+    lats_rad = np.radians(np.asarray(lats, dtype=dtype))
+    lngs_rad = np.radians(np.asarray(lngs, dtype=dtype))
+    lat_rad = dtype(math.radians(lat))
+    lng_rad = dtype(math.radians(lng))
+    return _haversine(lat_rad, lng_rad, lats_rad, lngs_rad).astype(dtype, copy=False)
+
+
+def paired_distances(lats_a, lngs_a, lats_b, lngs_b, dtype=np.float64) -> np.ndarray:
+    """Calculate distances in km between matching pairs of points (``a[i]`` to ``b[i]``)."""
+    return _haversine(
+        np.radians(np.asarray(lats_a, dtype=dtype)), np.radians(np.asarray(lngs_a, dtype=dtype)),
+        np.radians(np.asarray(lats_b, dtype=dtype)), np.radians(np.asarray(lngs_b, dtype=dtype)),
+    ).astype(dtype, copy=False)
+
+
+def distance_matrix(
+    points_a,
+    points_b,
+    dtype=np.float64,
+    chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """Calculate pairwise distances in km between two (n, 2) arrays of (lat, lng).
+
+    Rows of ``points_a`` are processed ``chunk_size`` at a time so temporaries
+    stay around a few million elements regardless of the matrix size.
+    """
+    a = np.radians(np.asarray(points_a, dtype=dtype).reshape(-1, 2))
+    b = np.radians(np.asarray(points_b, dtype=dtype).reshape(-1, 2))
+    result = np.empty((len(a), len(b)), dtype=dtype)
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 22) // max(len(b), 1))
+
+    lat_b, lng_b = b[:, 0][np.newaxis, :], b[:, 1][np.newaxis, :]
+    for start in range(0, len(a), chunk_size):
+        chunk = a[start:start + chunk_size]
+        result[start:start + len(chunk)] = _haversine(
+            chunk[:, 0][:, np.newaxis], chunk[:, 1][:, np.newaxis], lat_b, lng_b
+        )
+    return result
+
+
+@traced
 def filter_venues(
     df: pd.DataFrame,
     categories: Optional[list] = None,
     areas: Optional[list] = None,
     max_distance_km: Optional[float] = None,
-    search_query: Optional[str] = None
+    search_query: Optional[str] = None,
+    search_mode: str = "and",
+    open_at: Optional[datetime.datetime] = None,
+    open_for_min: float = 0,
+    region: Optional[str] = None
 ) -> pd.DataFrame:
-    """Filter venues by various criteria."""
-    filtered = df.copy()
+    """Filter venues by various criteria.
+
+    ``open_at`` keeps venues with known hours that are open at that time
+    and stay open for ``open_for_min`` more minutes. When ``df`` is the
+    shared store frame of ``region``, the store's query engine answers all
+    criteria from its precomputed bitmaps and indexes, and the result is
+    shared with every session asking the same question of the same dataset
+    version; other frames are scanned.
+    """
+    store = get_venue_store(region)
+    when = weekday_minute(open_at) if open_at is not None else None
+    if df is not store.df:
+        positions = _scan_positions(
+            df, store.accommodation, categories, areas, max_distance_km,
+            search_query, search_mode, when, open_for_min,
+        )
+        # A shallow slice shares the columns; copy-on-write keeps the caller's frame intact
+        return df[:] if positions is None else df.iloc[positions]
+
+    text = normalize_text(search_query)
+    if not (categories or areas or max_distance_km is not None or text or when is not None):
+        return df[:]
+    key = (
+        store.region, store.version,
+        tuple(sorted(set(categories or ()))), tuple(sorted(set(areas or ()))),
+        None if max_distance_km is None else float(max_distance_km),
+        text, search_mode if text else None,
+        when, float(open_for_min) if when is not None else None,
+    )
+
+    def compute() -> pd.DataFrame:
+        positions = store.query_engine.positions(
+            categories=categories, areas=areas, max_distance_km=max_distance_km,
+            search_query=text, search_mode=search_mode, open_at=when, open_for_min=open_for_min,
+        )
+        return df.iloc[positions]
+
+    # Cached frames are handed out as shallow slices, so callers cannot alter them
+    return _result_cache.get_or_create(key, compute)[:]
+
 
+def _scan_positions(
+    df: pd.DataFrame,
+    accommodation: dict,
+    categories: Optional[list],
+    areas: Optional[list],
+    max_distance_km: Optional[float],
+    search_query: Optional[str],
+    search_mode: str,
+    when: Optional[tuple],
+    open_for_min: float
+) -> Optional[np.ndarray]:
+    """Sorted positions of the rows of an arbitrary frame passing the filters (None: every row)."""
+    # Criteria narrow a sorted array of row positions, cheapest first
+    positions = None
     if categories:
-        filtered = filtered[filtered["category"].isin(categories)]
+        positions = _narrow(positions, df["category"].isin(categories).to_numpy())
 
     if areas:
-        filtered = filtered[filtered["area_name"].isin(areas)]
+        positions = _narrow(positions, df["area_name"].isin(areas).to_numpy())
 
     if max_distance_km is not None:
-        accommodation = get_accommodation()
-        acc_lat, acc_lng = accommodation["lat"], accommodation["lng"]
-
-        distances = filtered.apply(
-            lambda row: calculate_distance(acc_lat, acc_lng, row["lat"], row["lng"]),
-            axis=1
+        rows = positions if positions is not None else slice(None)
+        distances = distances_from(
+            accommodation["lat"], accommodation["lng"], df["lat"].to_numpy()[rows], df["lng"].to_numpy()[rows]
         )
-        filtered = filtered[distances <= max_distance_km]
+        positions = _narrow(positions, distances <= max_distance_km, subset=True)
 
     if search_query:
-        query = search_query.lower()
-        mask = (
-            filtered["name"].str.lower().str.contains(query, na=False) |
-            filtered["feature"].str.lower().str.contains(query, na=False) |
-            filtered["address"].str.lower().str.contains(query, na=False)
-        )
-        filtered = filtered[mask]
-
-    return filtered
+        subset = df if positions is None else df.iloc[positions]
+        positions = _narrow(positions, search_mask(subset, search_query, search_mode).to_numpy(), subset=True)
+
+    if when is not None:
+        hours = df["hours"] if positions is None else df["hours"].iloc[positions]
+        matches = HoursIndex(hours).open_at(*when, open_for_min)
+        positions = matches if positions is None else positions[matches]
+    return positions
+
+
+def _narrow(positions: Optional[np.ndarray], mask: np.ndarray, subset: bool = False) -> np.ndarray:
+    """Keep the positions passing ``mask``, given over all rows or (``subset``) over ``positions``."""
+    if positions is None:
+        return np.flatnonzero(mask)
+    return positions[mask] if subset else positions[mask[positions]]
+
+
+@traced
+def top_k(df: pd.DataFrame, k: int, column: str = "distance_km") -> pd.DataFrame:
+    """Get the ``k`` rows with the smallest ``column`` values, in sorted order.
+
+    Uses a partial selection instead of sorting the whole frame; ties are
+    broken by row order, so the result equals ``df.sort_values(column,
+    kind="stable").head(k)``.
+    """
+    values = df[column].to_numpy()
+    if k >= len(values):
+        return df.iloc[np.argsort(values, kind="stable")]
+    if k <= 0:
+        return df.iloc[:0]
+
+    kth = values[np.argpartition(values, k - 1)[:k]].max()
+    below = np.flatnonzero(values < kth)
+    ties = np.flatnonzero(values == kth)[:k - len(below)]
+    chosen = np.sort(np.concatenate([below, ties]))
+    return df.iloc[chosen[np.argsort(values[chosen], kind="stable")]]
 
 
 # Category display info
@@ -0,0 +1,230 @@
+"""Chunked venue export (CSV, GeoJSON, KML, XLSX) with a shared byte cache."""
+
+import datetime
+import io
+import json
+import zipfile
+from typing import Iterator, Optional
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.data_loader import get_venue_store
+from utils.search import normalize_text
+
+CHUNK_ROWS = 5000
+
+# Exported columns and their Korean headers, in file order
+EXPORT_COLUMNS = {
+    "name": "장소명",
+    "category": "카테고리",
+    "feature": "특징",
+    "address": "주소",
+    "hours": "운영시간",
+    "distance_km": "거리(km)",
+}
+
+EXPORT_FORMATS = {
+    "csv": {"label": "CSV", "mime": "text/csv", "extension": "csv"},
+    "geojson": {"label": "GeoJSON", "mime": "application/geo+json", "extension": "geojson"},
+    "kml": {"label": "KML (구글 지도)", "mime": "application/vnd.google-earth.kml+xml", "extension": "kml"},
+    "xlsx": {
+        "label": "Excel",
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "extension": "xlsx",
+    },
+}
+
+_export_cache = LRUCache(maxsize=64, maxbytes=64 * 1024 * 1024)
+
+
+def _chunks(df: pd.DataFrame, columns: list) -> Iterator[list]:
+    """Yield the frame as lists of row dicts, ``CHUNK_ROWS`` at a time."""
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df[columns].iloc[start:start + CHUNK_ROWS].to_dict("records")
+
+
+def _cell(value) -> str:
+    """Text for a cell, empty for missing values."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
+def _round_distance(value) -> float:
+    """Distance rounded for display-oriented formats."""
+    return round(float(value), 2)
+
+
+def _coordinate(value) -> float:
+    """Coordinate rounded to ~0.1 m, hiding float32 storage noise."""
+    return round(float(value), 6)
+
+
+def iter_csv(df: pd.DataFrame) -> Iterator[bytes]:
+    """Yield CSV (UTF-8 with BOM, for Excel) in chunks."""
+    columns = list(EXPORT_COLUMNS)
+    yield "\ufeff".encode("utf-8")
+    yield pd.DataFrame(columns=list(EXPORT_COLUMNS.values())).to_csv(index=False).encode("utf-8")
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df[columns].iloc[start:start + CHUNK_ROWS]
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+def iter_geojson(df: pd.DataFrame) -> Iterator[bytes]:
+    """Yield a GeoJSON FeatureCollection in chunks."""
+    yield b'{"type": "FeatureCollection", "features": ['
+    first = True
+    for rows in _chunks(df, list(EXPORT_COLUMNS) + ["lat", "lng"]):
+        features = []
+        for row in rows:
+            properties = {key: _cell(row[key]) for key in EXPORT_COLUMNS if key != "distance_km"}
+            properties["distance_km"] = _round_distance(row["distance_km"])
+            features.append(json.dumps({
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [_coordinate(row["lng"]), _coordinate(row["lat"])]},
+                "properties": properties,
+            }, ensure_ascii=False))
+        if features:
+            yield (("" if first else ",") + ",".join(features)).encode("utf-8")
+            first = False
+    yield b"]}"
+
+
+def iter_kml(df: pd.DataFrame) -> Iterator[bytes]:
+    """Yield a KML document with one Placemark per venue in chunks."""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>담양 리트릿</name>\n'
+    ).encode("utf-8")
+    for rows in _chunks(df, list(EXPORT_COLUMNS) + ["lat", "lng"]):
+        placemarks = []
+        for row in rows:
+            description = " · ".join(
+                p for p in [_cell(row["feature"]), _cell(row["address"]), _cell(row["hours"])] if p
+            )
+            placemarks.append(
+                f"<Placemark><name>{escape(_cell(row['name']))}</name>"
+                f"<description>{escape(description)}</description>"
+                f"<Point><coordinates>{_coordinate(row['lng'])},{_coordinate(row['lat'])}</coordinates></Point></Placemark>\n"
+            )
+        yield "".join(placemarks).encode("utf-8")
+    yield b"</Document></kml>\n"
+
+
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/></Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="venues" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/></Relationships>'
+    ),
+}
+
+
+def _xlsx_row(number: int, values: list) -> str:
+    """One worksheet row; strings are inline, numbers numeric."""
+    cells = []
+    for col, value in enumerate(values):
+        ref = f"{chr(ord('A') + col)}{number}"
+        if isinstance(value, float):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def write_xlsx(df: pd.DataFrame, target) -> None:
+    """Write a single-sheet XLSX workbook, streaming the sheet XML in chunks.
+
+    Written with zipfile directly so exports need no spreadsheet library.
+    """
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row(1, list(EXPORT_COLUMNS.values()))
+            ).encode("utf-8"))
+            number = 2
+            for rows in _chunks(df, list(EXPORT_COLUMNS)):
+                lines = []
+                for row in rows:
+                    values = [_cell(row[key]) for key in EXPORT_COLUMNS if key != "distance_km"]
+                    lines.append(_xlsx_row(number, values + [_round_distance(row["distance_km"])]))
+                    number += 1
+                sheet.write("".join(lines).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+
+def iter_xlsx(df: pd.DataFrame) -> Iterator[bytes]:
+    """Yield an XLSX workbook (zip archives need a seekable target, so one chunk)."""
+    buffer = io.BytesIO()
+    write_xlsx(df, buffer)
+    yield buffer.getvalue()
+
+
+_WRITERS = {"csv": iter_csv, "geojson": iter_geojson, "kml": iter_kml, "xlsx": iter_xlsx}
+
+
+def export_venues(df: pd.DataFrame, fmt: str) -> bytes:
+    """Encode venues (sorted by distance) in an export format."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return b"".join(_WRITERS[fmt](df.sort_values("distance_km", kind="stable")))
+
+
+def get_export(
+    df: pd.DataFrame,
+    fmt: str,
+    categories: Optional[list] = None,
+    search_query: Optional[str] = None,
+    open_at: Optional[datetime.datetime] = None,
+    region: Optional[str] = None
+) -> bytes:
+    """Get export bytes for a filtered view, cached by (content of its categories, filter state, format).
+
+    ``df`` must be the view selected by ``categories``, ``search_query`` and
+    ``open_at`` in ``region``; those, not the frame, identify the cache entry.
+    """
+    key = (
+        get_venue_store(region).content_tag(categories),
+        fmt,
+        tuple(sorted(categories or ())),
+        normalize_text(search_query or ""),
+        open_at.strftime("%w %H:%M") if open_at is not None else None,
+    )
+    return _export_cache.get_or_create(key, lambda: export_venues(df, fmt))
+
+
+def get_export_cache_stats() -> dict:
+    """Get export cache hit/miss/eviction counters."""
+    return _export_cache.stats()
@@ -0,0 +1,213 @@
+"""Synthetic venues.json datasets for scale testing.
+
+Venues are drawn from per-category vocabularies (names, features, notes,
+hours) across the base dataset's areas plus optional synthetic ones, from a
+seeded RNG, so the same arguments always produce the same file. Venues are
+streamed to disk one line at a time, so file size is not bounded by memory::
+
+    python -m utils.generator data/scale-1m.json 1000000 [SEED [EXTRA_AREAS]]
+"""
+
+import json
+import math
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from utils.data_loader import CATEGORY_INFO, DATA_PATH
+
+# Roughly the mix of the real dataset
+CATEGORY_WEIGHTS = {"cafe": 0.55, "restaurant": 0.3, "activity": 0.15}
+
+NAME_WORDS = (
+    "대숲", "죽향", "관방", "소쇄", "햇살", "바람", "들꽃", "담빛", "달빛", "노을",
+    "오월", "하루", "온", "솔", "숲속", "호수", "은하", "초록", "모래", "연리",
+)
+NAME_WORDS_2 = ("", "", "", "마을", "정원", "언덕", "뜰", "길", "한옥", "곳간")
+
+VOCABULARY = {
+    "cafe": {
+        "forms": ("카페 {w}", "{w} 커피", "{w}베이커리", "{w}당", "{w} 로스터스", "{w}다방"),
+        "subcategories": (
+            "베이커리", "소금빵", "대형카페", "한옥카페", "북카페", "LP카페", "감성카페",
+            "정원카페", "갤러리카페", "스페셜티", "카페",
+        ),
+        "features": (
+            "대형 베이커리", "매일 아침 굽는 소금빵", "한옥 감성", "넓은 잔디마당", "노키즈존",
+            "반려동물 가능", "LP 음악 감상", "갤러리 전시", "스페셜티 원두", "대나무숲 뷰",
+            "루프탑 좌석", "디저트 맛집", "주차 편리", "단체석 넉넉",
+        ),
+        "notes": (
+            "숙소와 가까움", "주차 공간 여유", "메타프로방스 인근", "관방제림 산책 후 방문 최적",
+            "비/눈 올 때 안전", "아침 픽업 유리", "방문 전 전화 확인 필요",
+        ),
+    },
+    "restaurant": {
+        "forms": ("{w}{s}", "{w} 식당", "원조 {w}{s}", "{w}집"),
+        "subcategories": ("국수", "떡갈비", "국밥", "닭볶음탕", "한정식", "중식", "대통밥", "순두부"),
+        "features": (
+            "한우 숯불 떡갈비", "멸치국수, 열무비빔국수", "3시간 육수", "막창전골", "토종닭 장작불",
+            "대통밥 정식", "짬뽕 맛집", "가성비", "현지인 추천", "웨이팅 있음",
+        ),
+        "notes": ("예약 필수", "넓은 주차장", "룸/아기의자", "영산강변 산책 적합", "재료 소진 시 마감"),
+    },
+    "activity": {
+        "forms": ("{w}상점", "{w} 공방", "{w} 책방", "{w}마켓", "{w} 편집샵"),
+        "subcategories": ("소품샵", "편집샵", "공방", "카페소품", "책방"),
+        "features": (
+            "아기자기한 소품샵", "캐릭터 굿즈", "감각적인 편집샵", "도자기 체험", "죽공예 체험",
+            "독립출판물", "향초 만들기", "고양이 상주",
+        ),
+        "notes": ("읍내 집중", "인스타 휴무 확인", "체험 예약 필요", "선물/기념품 해결 가능"),
+    },
+}
+
+ROADS = (
+    "죽향대로", "추성로", "천변{n}길", "객사{n}길", "담주{n}길", "송강정로", "면앙정로", "월광로",
+    "가사문학로", "창평현로", "금성산성길", "메타세쿼이아로", "죽녹원로", "담순로",
+)
+AREA_SYLLABLES = "가남대동명봉상서송신안양연오용월장죽창청평학한"
+AREA_RADIUS_KM = (3, 25)  # synthetic areas sit in this ring around the base camp
+UNKNOWN_HOURS = 0.15  # share of venues without hours, like the real data
+NOTE_SHARE = 0.6
+
+
+def synthetic_areas(count: int, center: dict, rng: random.Random) -> dict:
+    """Make ``count`` areas named like 면 and spread around ``center``."""
+    names = [a + b + "면" for a in AREA_SYLLABLES for b in AREA_SYLLABLES if a != b]
+    rng.shuffle(names)
+    if count > len(names):
+        raise ValueError(f"At most {len(names)} synthetic areas")
+    areas = {}
+    for i, name in enumerate(names[:count]):
+        distance = rng.uniform(*AREA_RADIUS_KM)
+        bearing = rng.uniform(0, 2 * math.pi)
+        areas[f"area_{i + 1:03d}"] = {
+            "lat": round(center["lat"] + distance / 111.0 * math.cos(bearing), 4),
+            "lng": round(center["lng"] + distance / (111.0 * math.cos(math.radians(center["lat"]))) * math.sin(bearing), 4),
+            "name": name,
+        }
+    return areas
+
+
+def _time(minutes: int) -> str:
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def random_hours(category: str, rng: random.Random) -> str:
+    """An hours text in the styles of the real data (breaks, last order, closed days, weekend hours)."""
+    if rng.random() < UNKNOWN_HOURS:
+        return ""
+    open_minute = rng.choice((8, 9, 10, 11, 11, 12)) * 60 + rng.choice((0, 0, 30))
+    close_minute = rng.choice((18, 19, 20, 21, 21, 22)) * 60 + rng.choice((0, 0, 30))
+    if category == "restaurant" and rng.random() < 0.05:
+        close_minute = rng.choice((1, 2)) * 60  # late-night places
+    text = f"{_time(open_minute)}~{_time(close_minute)}"
+
+    extras = []
+    roll = rng.random()
+    if category == "restaurant" and roll < 0.4:
+        start = rng.choice((14, 15))
+        extras.append(f"BT {start}~{start + 2}시")
+    elif roll < 0.6:
+        extras.append(f"LO {_time(close_minute - 30)}")
+    elif roll < 0.7 and close_minute >= 18 * 60:
+        extras.append(f"주말~{(close_minute + 60) // 60}시")
+
+    closed = ""
+    roll = rng.random()
+    if roll < 0.4:
+        closed = f"{rng.choice('월화수목')} 휴무"
+    elif roll < 0.5:
+        first, second = sorted(rng.sample(range(4), 2))
+        closed = f"{'월화수목'[first]},{'월화수목'[second]} 휴무"
+    elif roll < 0.55:
+        closed = "연중무휴"
+
+    if extras:
+        text += f"({extras[0]})"
+    elif closed and closed != "연중무휴" and rng.random() < 0.5:
+        text, closed = f"{text}({closed})", ""
+    return f"{text}, {closed}" if closed else text
+
+
+def generate_venues(count: int, areas: dict, seed: int = 0) -> Iterator[dict]:
+    """Yield ``count`` venues with ids 1..count, deterministically from ``seed``.
+
+    Names repeat across the vocabulary, so repeats get a branch suffix
+    ("…2호점"), keeping names (and their derived coordinates) distinct.
+    """
+    rng = random.Random(seed)
+    categories = list(CATEGORY_INFO)
+    weights = [CATEGORY_WEIGHTS.get(category, 0.1) for category in categories]
+    area_keys = list(areas)
+    area_labels = {key: re.sub(r"\(.*\)", "", area["name"]) for key, area in areas.items()}
+    seen = {}
+
+    for venue_id in range(1, count + 1):
+        category = rng.choices(categories, weights)[0]
+        vocab = VOCABULARY.get(category, VOCABULARY["activity"])
+        area = rng.choice(area_keys)
+        subcategory = rng.choice(vocab["subcategories"])
+        word = rng.choice(NAME_WORDS) + rng.choice(NAME_WORDS_2)
+        name = rng.choice(vocab["forms"]).format(w=word, s=subcategory)
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name} {seen[name]}호점"
+
+        road = rng.choice(ROADS).format(n=rng.randint(1, 9))
+        number = str(rng.randint(1, 1500)) + (f"-{rng.randint(1, 60)}" if rng.random() < 0.3 else "")
+        venue = {
+            "id": venue_id,
+            "category": category,
+            "name": name,
+            "feature": ", ".join(rng.sample(vocab["features"], rng.choice((1, 1, 2)))),
+            "address": f"{area_labels[area]} {road} {number}",
+            "area": area,
+            "url": "https://naver.me/" + "".join(rng.choices("ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz0123456789", k=8)),
+            "hours": random_hours(category, rng),
+            "subcategory": subcategory,
+        }
+        if rng.random() < NOTE_SHARE:
+            venue["note"] = rng.choice(vocab["notes"])
+        yield venue
+
+
+def write_dataset(target: Path, count: int, seed: int = 0, extra_areas: int = 0, base: Path = DATA_PATH) -> Path:
+    """Stream a ``count``-venue dataset to ``target`` (atomically), in the layout of venues.json.
+
+    The base camp and areas come from ``base``, plus ``extra_areas``
+    synthetic areas around the base camp.
+    """
+    with open(base, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    accommodation = data["accommodation"]
+    areas = {**data["areas"], **synthetic_areas(extra_areas, accommodation, random.Random(seed))}
+
+    target = Path(target)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write('{\n  "accommodation": ')
+        f.write(json.dumps(accommodation, ensure_ascii=False))
+        f.write(',\n  "areas": {\n')
+        f.write(",\n".join(
+            f"    {json.dumps(key)}: {json.dumps(area, ensure_ascii=False)}" for key, area in areas.items()
+        ))
+        f.write('\n  },\n  "venues": [')
+        separator = "\n"
+        for venue in generate_venues(count, areas, seed):
+            f.write(separator)
+            f.write("    ")
+            f.write(json.dumps(venue, ensure_ascii=False))
+            separator = ",\n"
+        f.write("\n  ]\n}\n")
+    tmp.replace(target)
+    return target
+
+
+if __name__ == "__main__":
+    if not 3 <= len(sys.argv) <= 5:
+        sys.exit("usage: python -m utils.generator TARGET COUNT [SEED [EXTRA_AREAS]]")
+    print(f"Wrote {write_dataset(Path(sys.argv[1]), *(int(arg) for arg in sys.argv[2:]))}")
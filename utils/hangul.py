@@ -0,0 +1,189 @@
+"""Hangul jamo decomposition and prefix indexes for as-you-type venue search."""
+
+import bisect
+import re
+from itertools import compress
+
+import numpy as np
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+            "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# Compound jamo split into the keystrokes that build them on a 2-set keyboard
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_LAST = 0xD7A3
+
+MAX_KEY_LENGTH = 12  # indexed key length in jamo; longer queries are verified by scan
+
+_WORD_SPLIT = re.compile(r"[\s,·/()\[\]]+")
+
+
+def is_syllable(char: str) -> bool:
+    """Check whether a character is a precomposed Hangul syllable."""
+    return SYLLABLE_BASE <= ord(char) <= SYLLABLE_LAST
+
+
+def _build_tables() -> tuple:
+    """Build str.translate tables for syllable decomposition and chosung."""
+    jamo_table = {ord(k): v for k, v in COMPOUND_JAMO.items()}
+    chosung_table = {}
+    for code in range(SYLLABLE_BASE, SYLLABLE_LAST + 1):
+        initial, rest = divmod(code - SYLLABLE_BASE, 21 * 28)
+        medial, final = divmod(rest, 28)
+        jamo_table[code] = (
+            CHOSUNG[initial]
+            + COMPOUND_JAMO.get(JUNGSUNG[medial], JUNGSUNG[medial])
+            + COMPOUND_JAMO.get(JONGSUNG[final], JONGSUNG[final])
+        )
+        chosung_table[code] = CHOSUNG[initial]
+    return jamo_table, chosung_table
+
+
+_JAMO_TABLE, _CHOSUNG_TABLE = _build_tables()
+
+
+def decompose(text: str) -> str:
+    """Decompose Hangul into its keystroke jamo sequence ("닭" -> "ㄷㅏㄹㄱ").
+
+    Partially composed input decomposes to a prefix of the finished word's
+    sequence ("속" -> "ㅅㅗㄱ" for "소금"), which is what makes as-you-type
+    prefix matching work. Non-Hangul characters are lowercased and kept.
+    """
+    return text.lower().translate(_JAMO_TABLE)
+
+
+def chosung(text: str) -> str:
+    """Get the initial consonants of Hangul syllables ("소금빵" -> "ㅅㄱㅃ")."""
+    return text.lower().translate(_CHOSUNG_TABLE)
+
+
+def is_chosung_query(text: str) -> bool:
+    """Check whether a query is made only of initial consonants ("ㅅㄱㅃ")."""
+    stripped = "".join(text.split())
+    return bool(stripped) and all(char in CHOSUNG for char in stripped)
+
+
+def word_start_suffixes(text: str) -> list:
+    """Get the text from each word start onward, with separators removed.
+
+    Lets a prefix match start at any word ("담양 소금빵" -> "담양소금빵", "소금빵").
+    """
+    words = [w for w in _WORD_SPLIT.split(text) if w]
+    return ["".join(words[i:]) for i in range(len(words))]
+
+
+class SortedPrefixIndex:
+    """Sorted list of jamo keys with their row positions, searched with ``bisect``.
+
+    Not a trie: the keys sharing a prefix are a contiguous range of the
+    sorted list, found with two binary searches (O(log n) string
+    comparisons), after which only the matching rows are read. Building is
+    a single sort of the keys.
+    """
+
+    def __init__(self, keys: list, rows: list):
+        keys = [key[:MAX_KEY_LENGTH] for key in keys]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._rows = np.asarray(rows, dtype=np.int64)[order] if order else np.zeros(0, dtype=np.int64)
+
+    def updated(self, remap: np.ndarray, keys: list, rows: list) -> "SortedPrefixIndex":
+        """An index with rows renumbered by ``remap`` (dropped where it is -1) plus new entries.
+
+        Kept keys are already sorted, so the sort only merges in the new ones.
+        """
+        moved = remap[self._rows]
+        keep = moved >= 0
+        merged = list(compress(self._keys, keep.tolist())) + [key[:MAX_KEY_LENGTH] for key in keys]
+        merged_rows = np.concatenate([moved[keep], np.asarray(rows, dtype=np.int64)])
+        order = sorted(range(len(merged)), key=merged.__getitem__)
+        index = SortedPrefixIndex.__new__(SortedPrefixIndex)
+        index._keys = [merged[i] for i in order]
+        index._rows = merged_rows[order] if order else np.zeros(0, dtype=np.int64)
+        return index
+
+    def lookup(self, prefix: str) -> np.ndarray:
+        """Get sorted row positions with a key starting with ``prefix[:MAX_KEY_LENGTH]``."""
+        prefix = prefix[:MAX_KEY_LENGTH]
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        return np.unique(self._rows[lo:hi])
+
+
+def _fields(text: str) -> list:
+    """Split newline-joined searchable fields."""
+    return text.split("\n")
+
+
+def _word_suffixes(texts: list, rows) -> tuple:
+    """Get (key suffixes, their rows) for the given rows of ``texts``."""
+    suffixes, suffix_rows = [], []
+    for row in rows:
+        for field in _fields(texts[row]):
+            for suffix in word_start_suffixes(field):
+                suffixes.append(suffix[:MAX_KEY_LENGTH])
+                suffix_rows.append(row)
+    return suffixes, suffix_rows
+
+
+class HangulPrefixIndex:
+    """Chosung and full-jamo sorted prefix indexes over venue names and features.
+
+    Keys are cut at ``MAX_KEY_LENGTH`` jamo; longer queries are verified
+    against the candidate rows' texts.
+    """
+
+    def __init__(self, texts):
+        self._texts = list(texts)
+        suffixes, rows = _word_suffixes(self._texts, range(len(self._texts)))
+        self._chosung = SortedPrefixIndex([chosung(suffix) for suffix in suffixes], rows)
+        self._jamo = SortedPrefixIndex([decompose(suffix) for suffix in suffixes], rows)
+
+    def updated(self, texts, remap: np.ndarray, changed) -> "HangulPrefixIndex":
+        """Index ``texts`` by carrying over this index's sorted keys.
+
+        ``remap`` maps old row positions to new ones (-1 for removed or
+        changed rows); only the ``changed`` new rows are decomposed.
+        """
+        index = HangulPrefixIndex.__new__(HangulPrefixIndex)
+        index._texts = list(texts)
+        suffixes, rows = _word_suffixes(index._texts, changed)
+        index._chosung = self._chosung.updated(remap, [chosung(suffix) for suffix in suffixes], rows)
+        index._jamo = self._jamo.updated(remap, [decompose(suffix) for suffix in suffixes], rows)
+        return index
+
+    def lookup(self, query: str) -> np.ndarray:
+        """Get sorted row positions matching ``query`` as a chosung or jamo prefix."""
+        compact = "".join(query.split())
+        if not compact:
+            return np.zeros(0, dtype=np.int64)
+        if is_chosung_query(compact):
+            key, rows = compact, self._chosung.lookup(compact)
+        else:
+            key = decompose(compact)
+            rows = self._jamo.lookup(key)
+        if len(key) <= MAX_KEY_LENGTH:
+            return rows
+        return np.asarray([r for r in rows if prefix_matches(self._texts[r], compact)], dtype=np.int64)
+
+
+def prefix_matches(text: str, query: str) -> bool:
+    """Scan-based equivalent of ``HangulPrefixIndex.lookup`` for a single text."""
+    compact = "".join(query.split())
+    if not compact:
+        return False
+    chosung_query = is_chosung_query(compact)
+    key = compact if chosung_query else decompose(compact)
+    for field in _fields(text):
+        for suffix in word_start_suffixes(field):
+            if (chosung(suffix) if chosung_query else decompose(suffix)).startswith(key):
+                return True
+    return False
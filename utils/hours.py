@@ -0,0 +1,253 @@
+"""Opening-hours parsing and an interval index for "open at time T" queries.
+
+The free-text ``hours`` field looks like ``11:00~21:00(BT 15~17시), 월 휴무``
+or ``11:00~19:00(주말~20시), 수 휴무``. Each distinct text is parsed once
+into minute intervals per weekday; last order (LO) counts as closing time.
+"""
+
+import datetime
+import re
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = "월화수목금토일"  # Monday first, matching date.weekday()
+WEEKEND = (5, 6)
+DAY_MINUTES = 24 * 60
+TIMEZONE = ZoneInfo("Asia/Seoul")
+
+_TIME = r"(\d{1,2})(?::(\d{2})|\s*시(?:\s*(\d{1,2})\s*분)?)?"
+_RANGE = re.compile(_TIME + r"\s*[~\-–]\s*" + _TIME)
+_LAST_ORDER = re.compile(r"(?:L\.?O\.?|라스트\s*오더)\s*" + _TIME, re.IGNORECASE)
+_BREAK = re.compile(r"(?:BT|브레이크\s*(?:타임)?)\s*" + _TIME + r"\s*[~\-–]\s*" + _TIME, re.IGNORECASE)
+_DAY_GROUP = (
+    rf"(?<![가-힣])(?:주말|평일|[{WEEKDAYS}]\s*[~\-–]\s*[{WEEKDAYS}]"
+    rf"|[{WEEKDAYS}](?:\s*[,·/]?\s*[{WEEKDAYS}])*)"
+)
+_OVERRIDE = re.compile(rf"({_DAY_GROUP})\s*(?:요일)?\s*(?:{_TIME})?\s*[~\-–]\s*{_TIME}")
+_CLOSED_DAYS = re.compile(rf"({_DAY_GROUP})\s*(?:요일)?\s*(?:정기\s*)?휴무")
+# Left over after the patterns above, these mean the text says more than was understood
+_UNPARSED = re.compile(rf"\d|(?<![가-힣])[{WEEKDAYS}](?:요일)?(?![가-힣])")
+MAX_HOUR = 30  # "26:00"-style closing times past midnight
+
+
+def _minutes(hour, minute, minute_alt) -> int:
+    """Minutes after midnight from regex groups of ``_TIME``; ValueError when out of range."""
+    hour, minute = int(hour), int(minute or minute_alt or 0)
+    if hour > MAX_HOUR or minute >= 60:
+        raise ValueError(f"Not a time of day: {hour}:{minute:02d}")
+    return hour * 60 + minute
+
+
+def _days(group: str) -> list:
+    """Weekday numbers named by a day group (주말, 평일, 화~일 or 월,화...)."""
+    if group == "주말":
+        return list(WEEKEND)
+    if group == "평일":
+        return [d for d in range(7) if d not in WEEKEND]
+    days = [WEEKDAYS.index(day) for day in re.findall(rf"[{WEEKDAYS}]", group)]
+    if re.search(r"[~\-–]", group):
+        first, last = days
+        return [(first + k) % 7 for k in range((last - first) % 7 + 1)]
+    return days
+
+
+def _interval(start: int, end: int) -> tuple:
+    """An (open, close) interval; a close at or before open runs past midnight."""
+    if start >= DAY_MINUTES:
+        raise ValueError(f"Opening past midnight: {start}")
+    return (start, end + DAY_MINUTES if end <= start else end)
+
+
+def _blank(text: str, spans: list) -> str:
+    """Replace the given (start, end) spans of ``text`` with spaces."""
+    chars = list(text)
+    for a, b in spans:
+        chars[a:b] = " " * (b - a)
+    return "".join(chars)
+
+
+def parse_hours(text) -> Optional[list]:
+    """Parse hours text into seven lists of (open, close) minute intervals, Monday first.
+
+    Closed days have no intervals; close may pass midnight (> 1440).
+    Returns None (unknown) when the text has no recognizable time range,
+    or mentions times or days the patterns do not account for.
+    """
+    try:
+        return _parse_hours(text if isinstance(text, str) else "")
+    except ValueError:
+        return None
+
+
+def _parse_hours(text: str) -> Optional[list]:
+    """``parse_hours`` body; raises ValueError for impossible times."""
+    # Modifiers are parsed first and blanked so the main range search skips them
+    overrides, consumed = [], []
+    for match in _OVERRIDE.finditer(text):
+        groups = match.groups()
+        start = _minutes(*groups[1:4]) if groups[1] is not None else None
+        overrides.append((_days(groups[0]), start, _minutes(*groups[4:7])))
+        consumed.append(match.span())
+    breaks = []
+    for match in _BREAK.finditer(text):
+        breaks.append((_minutes(*match.groups()[:3]), _minutes(*match.groups()[3:])))
+        consumed.append(match.span())
+    last_order = []
+    for match in _LAST_ORDER.finditer(text):
+        last_order.append(_minutes(*match.groups()))
+        consumed.append(match.span())
+    closed = set()
+    for match in _CLOSED_DAYS.finditer(text):
+        closed.update(_days(match.group(1)))
+        consumed.append(match.span())
+
+    main_text = _blank(text, consumed)
+    ranges = []
+    for match in _RANGE.finditer(main_text):
+        groups = match.groups()
+        ranges.append((_minutes(*groups[:3]), _minutes(*groups[3:])))
+        consumed.append(match.span())
+    if not ranges and not overrides:
+        return None
+    if _UNPARSED.search(_blank(text, consumed)):
+        return None
+
+    # Per day: day-specific ranges replace the main ones; an override
+    # without an opening time ("주말~20시") only moves the last closing time
+    week = []
+    for day in range(7):
+        spans = [] if day in closed else list(ranges)
+        specific = [(start, end) for days, start, end in overrides if day in days and start is not None]
+        if specific and day not in closed:
+            spans = specific
+        elif not ranges and not specific:
+            spans = []  # only day-specific ranges ("토 10:00~15:00"): other days are closed
+        for days, start, end in overrides:
+            if day in days and start is None and spans:
+                spans[-1] = (spans[-1][0], end)
+        intervals = [_interval(start, end) for start, end in spans]
+        if intervals and last_order:
+            cutoff = _interval(intervals[-1][0], last_order[-1])[1]
+            intervals[-1] = (intervals[-1][0], min(intervals[-1][1], cutoff))
+
+        for break_start, break_end in breaks:
+            split = []
+            for a, b in intervals:
+                if break_start < b and break_end > a:
+                    split += [(a, break_start)] if break_start > a else []
+                    split += [(break_end, b)] if break_end < b else []
+                else:
+                    split.append((a, b))
+            intervals = split
+        week.append(intervals)
+    return week
+
+
+def weekday_minute(when: datetime.datetime) -> tuple:
+    """Split a datetime into (weekday, minutes after midnight)."""
+    return when.weekday(), when.hour * 60 + when.minute
+
+
+def now_local() -> datetime.datetime:
+    """Current time in Korea, where every venue is."""
+    return datetime.datetime.now(TIMEZONE)
+
+
+def format_minutes(minutes) -> str:
+    """Format minutes after midnight as HH:MM."""
+    minutes = int(round(minutes))
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+class HoursIndex:
+    """Compiled opening hours for a column of hours texts.
+
+    Every distinct text is parsed once into per-weekday interval arrays
+    (intervals running past midnight also appear on the next day, shifted
+    back a day). Per weekday, all intervals are sorted by opening minute so
+    "open at T" is a binary search plus one vectorized comparison. Rows
+    with unknown hours count as open all day, but are excluded from
+    ``open_at`` unless asked for. Passing per-row ``codes`` into the
+    distinct ``texts`` (as a compiled artifact stores them) skips
+    factorizing the column.
+    """
+
+    def __init__(self, hours=(), codes=None, texts=None):
+        if codes is None:
+            hours = hours if isinstance(hours, pd.Series) else pd.Series(list(hours), dtype=object)
+            codes, texts = pd.factorize(hours, use_na_sentinel=False)
+            texts = texts.tolist()
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.texts = list(texts)
+        parsed = [parse_hours(text) for text in texts]
+        self.known_codes = np.array([week is not None for week in parsed], dtype=bool)
+        self.known = self.known_codes[self.codes] if len(self.codes) else np.zeros(0, dtype=bool)
+
+        # Per weekday: that day's intervals plus the previous day's overnight spill
+        all_day = [[(0, DAY_MINUTES)]] * 7
+        days = []
+        for day in range(7):
+            days.append([
+                (week or all_day)[day]
+                + [(a - DAY_MINUTES, b - DAY_MINUTES) for a, b in (week or all_day)[day - 1] if b > DAY_MINUTES]
+                for week in parsed
+            ])
+        width = max([1] + [len(intervals) for day in days for intervals in day])
+
+        # Dense (texts, width) windows per weekday, padded with empty intervals
+        self.starts = np.full((7, len(texts), width), np.inf, dtype=np.float32)
+        self.ends = np.full((7, len(texts), width), -np.inf, dtype=np.float32)
+        for day, per_text in enumerate(days):
+            for code, intervals in enumerate(per_text):
+                for k, (a, b) in enumerate(intervals):
+                    self.starts[day, code, k], self.ends[day, code, k] = a, b
+
+        # Interval index: known texts' intervals per weekday, sorted by opening
+        self._sorted = []
+        for day in range(7):
+            code_grid = np.broadcast_to(np.arange(len(texts))[:, None], (len(texts), width))
+            valid = np.isfinite(self.starts[day]) & self.known_codes[:, None]
+            order = np.argsort(self.starts[day][valid], kind="stable")
+            self._sorted.append((
+                self.starts[day][valid][order], self.ends[day][valid][order], code_grid[valid][order]
+            ))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def open_codes(self, weekday: int, minute: float, duration: float = 0) -> np.ndarray:
+        """Boolean mask over distinct texts open from ``minute`` for ``duration`` minutes."""
+        starts, ends, codes = self._sorted[weekday]
+        count = np.searchsorted(starts, minute, side="right")
+        mask = np.zeros(len(self.known_codes), dtype=bool)
+        ends = ends[:count]
+        mask[codes[:count][(ends > minute) & (ends >= minute + duration)]] = True
+        return mask
+
+    def open_at(
+        self,
+        weekday: int,
+        minute: float,
+        duration: float = 0,
+        include_unknown: bool = False
+    ) -> np.ndarray:
+        """Get sorted row positions open at ``minute`` and for ``duration`` minutes after."""
+        mask = self.open_codes(weekday, minute, duration)
+        if include_unknown:
+            mask |= ~self.known_codes
+        return np.flatnonzero(mask[self.codes]) if len(self.codes) else np.zeros(0, dtype=np.int64)
+
+    def earliest_start(self, positions, weekday: int, arrival, stay: float) -> np.ndarray:
+        """Earliest minute each row can start a ``stay``-minute visit when arriving at ``arrival``.
+
+        ``arrival`` broadcasts against ``positions`` (e.g. shape (beams, len(positions)));
+        infeasible visits get inf.
+        """
+        codes = self.codes[np.asarray(positions)]
+        arrival = np.asarray(arrival, dtype=np.float64)[..., None]
+        begin = np.maximum(arrival, self.starts[weekday][codes])
+        begin = np.where(begin + stay <= self.ends[weekday][codes], begin, np.inf)
+        return begin.min(axis=-1)
@@ -0,0 +1,157 @@
+"""Checkout-day itinerary planning: one venue per stage, least total travel."""
+
+import datetime
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from utils.cache import LRUCache
+from utils.data_loader import distance_matrix, get_venue_store
+from utils.routing import estimate_minutes, get_road_graph, get_venue_travel_matrix
+
+CHECKOUT_DATE = datetime.date(2026, 2, 14)
+CHECKOUT_MINUTE = 11 * 60
+
+# Stage order after checkout; stay_min is the planned time at each venue
+DEFAULT_STAGES = (
+    {"label": "점심", "category": "restaurant", "stay_min": 70, "exclude_subcategories": ("중식",)},
+    {"label": "카페", "category": "cafe", "stay_min": 60},
+    {"label": "소품샵", "category": "activity", "stay_min": 40},
+)
+
+BEAM_WIDTH = 512
+
+_plan_cache = LRUCache(maxsize=32)
+
+
+@dataclass(frozen=True)
+class Plan:
+    """One itinerary: a stop dict per stage plus totals."""
+
+    stops: list
+    total_km: float
+    end_minute: float
+
+
+def _candidates(df, stage: dict) -> np.ndarray:
+    """Store positions of the venues eligible for a stage."""
+    mask = (df["category"] == stage["category"]).to_numpy()
+    excluded = stage.get("exclude_subcategories")
+    if excluded:
+        mask = mask & ~df["subcategory"].isin(excluded).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def plan_itinerary(
+    stages=DEFAULT_STAGES,
+    start_minute: float = CHECKOUT_MINUTE,
+    weekday: int = CHECKOUT_DATE.weekday(),
+    top_n: int = 3,
+    beam_width: int = BEAM_WIDTH,
+    region: Optional[str] = None
+) -> list:
+    """Find the ``top_n`` plans with the least total travel distance from the base camp.
+
+    Dynamic programming over stages keeps, for every candidate venue, the
+    ``top_n`` cheapest partial plans ending there, then caps the frontier at
+    ``beam_width`` partial plans. A stop is feasible when one of the venue's
+    opening intervals (after breaks and last order) fits the whole stay,
+    waiting for opening if early; unknown hours count as open.
+    """
+    store = get_venue_store(region)
+    df = store.df
+    lats = df["lat"].to_numpy(dtype=np.float64)
+    lngs = df["lng"].to_numpy(dtype=np.float64)
+    base = np.array([[store.accommodation["lat"], store.accommodation["lng"]]])
+    minutes_matrix = get_venue_travel_matrix("drive", region) if get_road_graph(region) is not None else None
+    hours_index = store.hours_index
+
+    # Frontier of partial plans; position -1 is the base camp
+    last = np.array([-1])
+    cost = np.zeros(1)
+    clock = np.array([float(start_minute)])
+    paths = np.empty((1, 0), dtype=np.int64)
+    arrivals = np.empty((1, 0))
+
+    for stage in stages:
+        cand = _candidates(df, stage)
+        if len(cand) == 0 or len(last) == 0:
+            return []
+        origins = np.where(
+            (last < 0)[:, None], base, np.column_stack([lats[last], lngs[last]])
+        )
+        km = distance_matrix(origins, np.column_stack([lats[cand], lngs[cand]]))
+        minutes = minutes_matrix[np.ix_(last + 1, cand + 1)] if minutes_matrix is not None \
+            else estimate_minutes(km)
+
+        begin = hours_index.earliest_start(cand, weekday, clock[:, None] + minutes, stage["stay_min"])
+        feasible = np.isfinite(begin)
+        if paths.shape[1]:
+            feasible &= ~(paths[:, :, None] == cand[None, None, :]).any(axis=1)
+        total = np.where(feasible, cost[:, None] + km, np.inf)
+
+        # Best top_n predecessors per candidate, then the global beam cap
+        if len(last) > top_n:
+            rows = np.argpartition(total, top_n - 1, axis=0)[:top_n]
+        else:
+            rows = np.broadcast_to(np.arange(len(last))[:, None], (len(last), len(cand)))
+        cols = np.broadcast_to(np.arange(len(cand)), rows.shape)
+        rows, cols = rows.ravel(), cols.ravel()
+        keep = np.flatnonzero(np.isfinite(total[rows, cols]))
+        if len(keep) > beam_width:
+            keep = keep[np.argpartition(total[rows[keep], cols[keep]], beam_width - 1)[:beam_width]]
+        rows, cols = rows[keep], cols[keep]
+
+        last = cand[cols]
+        cost = total[rows, cols]
+        clock = begin[rows, cols] + stage["stay_min"]
+        paths = np.column_stack([paths[rows], last])
+        arrivals = np.column_stack([arrivals[rows], begin[rows, cols]])
+
+    best = np.lexsort((clock, cost))[:top_n]
+    plans = []
+    for i in best:
+        stops = []
+        prev = None
+        for stage, position, arrive in zip(stages, paths[i], arrivals[i]):
+            origin = base if prev is None else [[lats[prev], lngs[prev]]]
+            row = df.iloc[position]
+            stops.append({
+                "label": stage["label"],
+                "position": int(position),
+                "id": int(row["id"]),
+                "name": row["name"],
+                "category": row["category"],
+                "arrive": float(arrive),
+                "leave": float(arrive) + stage["stay_min"],
+                "km": float(distance_matrix(origin, [[lats[position], lngs[position]]])[0, 0]),
+            })
+            prev = position
+        plans.append(Plan(stops=stops, total_km=float(cost[i]), end_minute=float(clock[i])))
+    return plans
+
+
+def _stages_key(stages) -> tuple:
+    """Hashable form of a stage sequence."""
+    return tuple(tuple(sorted(stage.items())) for stage in stages)
+
+
+def get_itinerary_plans(
+    stages=DEFAULT_STAGES,
+    start_minute: float = CHECKOUT_MINUTE,
+    weekday: int = CHECKOUT_DATE.weekday(),
+    top_n: int = 3,
+    region: Optional[str] = None
+) -> list:
+    """Get ``plan_itinerary`` results, cached per content of the stage categories, road graph and request."""
+    store = get_venue_store(region)
+    graph = get_road_graph(region)
+    key = (
+        store.content_tag([stage["category"] for stage in stages]),
+        graph.digest if graph is not None else "estimate",
+        _stages_key(stages), start_minute, weekday, top_n,
+    )
+    return _plan_cache.get_or_create(
+        key, lambda: plan_itinerary(stages, start_minute, weekday, top_n, region=region)
+    )
@@ -0,0 +1,124 @@
+"""Bitmap query engine over a store's venue frame."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import distances_from
+
+FACET_COLUMNS = ("category", "area_name", "subcategory")
+DISTANCE_BANDS_KM = (1, 2, 3, 5, 10, 15, 20, 30)
+
+
+def pack(mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean row mask into a bitmap (8 rows per byte)."""
+    return np.packbits(mask, bitorder="little")
+
+
+def unpack(bits: np.ndarray, size: int) -> np.ndarray:
+    """Expand a bitmap of ``size`` rows back into a boolean mask."""
+    return np.unpackbits(bits, count=size, bitorder="little").view(bool)
+
+
+def bits_at(bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Boolean mask of which ``positions`` are set in a bitmap."""
+    return ((bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).astype(bool)
+
+
+class QueryEngine:
+    """Precomputed row bitmaps for answering venue filters by intersection.
+
+    Every category, area name and subcategory gets a packed bitmap at load,
+    as does every band of ``DISTANCE_BANDS_KM`` around the base camp.
+    Within a facet the wanted values are OR-ed and facets are AND-ed, one
+    byte per 8 rows. Other radii come from the rows sorted by distance (a
+    prefix), and search and hours come from their own indexes as sorted
+    positions. When any predicate yields positions, the bitmaps are probed
+    at just those positions instead of being unpacked.
+    """
+
+    def __init__(self, df: pd.DataFrame, base: tuple, search_index, hours_index):
+        self.size = len(df)
+        self.search_index = search_index
+        self.hours_index = hours_index
+
+        self.facets = {}
+        for column in FACET_COLUMNS:
+            if column not in df:
+                continue
+            codes, values = pd.factorize(df[column], use_na_sentinel=True)
+            self.facets[column] = {value: pack(codes == code) for code, value in enumerate(values.tolist())}
+
+        distances = distances_from(*base, df["lat"].to_numpy(), df["lng"].to_numpy())
+        self.by_distance = np.argsort(distances, kind="stable")
+        self.sorted_distances = distances[self.by_distance]
+        self.bands = {float(km): pack(distances <= km) for km in DISTANCE_BANDS_KM}
+        self._empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the bitmaps and the distance order."""
+        bitmaps = [bits for values in self.facets.values() for bits in values.values()]
+        bitmaps += list(self.bands.values())
+        return sum(bits.nbytes for bits in bitmaps) + self.by_distance.nbytes + self.sorted_distances.nbytes
+
+    def facet(self, column: str, values) -> np.ndarray:
+        """Bitmap of rows whose ``column`` is any of ``values``."""
+        bitmaps = self.facets.get(column, {})
+        selected = [bitmaps[value] for value in values if value in bitmaps]
+        if not selected:
+            return self._empty
+        return selected[0] if len(selected) == 1 else np.bitwise_or.reduce(selected)
+
+    def within(self, km: float) -> np.ndarray:
+        """Sorted row positions within ``km`` of the base camp."""
+        count = np.searchsorted(self.sorted_distances, km, side="right")
+        return np.sort(self.by_distance[:count])
+
+    def positions(
+        self,
+        categories: Optional[list] = None,
+        areas: Optional[list] = None,
+        subcategories: Optional[list] = None,
+        max_distance_km: Optional[float] = None,
+        search_query: Optional[str] = None,
+        search_mode: str = "and",
+        open_at: Optional[tuple] = None,
+        open_for_min: float = 0
+    ) -> Optional[np.ndarray]:
+        """Sorted row positions matching every given predicate (None when none is given).
+
+        ``open_at`` is a (weekday, minute) pair.
+        """
+        bitmaps = []
+        if categories:
+            bitmaps.append(self.facet("category", categories))
+        if areas:
+            bitmaps.append(self.facet("area_name", areas))
+        if subcategories:
+            bitmaps.append(self.facet("subcategory", subcategories))
+
+        positions = None
+        if max_distance_km is not None:
+            band = self.bands.get(float(max_distance_km))
+            if band is not None:
+                bitmaps.append(band)
+            else:
+                positions = self.within(max_distance_km)
+        if search_query:
+            matches = self.search_index.query(search_query, search_mode)
+            positions = matches if positions is None else np.intersect1d(positions, matches)
+        if open_at is not None:
+            matches = self.hours_index.open_at(*open_at, open_for_min)
+            positions = matches if positions is None else np.intersect1d(positions, matches)
+
+        if positions is None:
+            if not bitmaps:
+                return None
+            bits = bitmaps[0] if len(bitmaps) == 1 else np.bitwise_and.reduce(bitmaps)
+            return np.flatnonzero(unpack(bits, self.size))
+        positions = np.asarray(positions, dtype=np.int64)
+        for bits in bitmaps:
+            positions = positions[bits_at(bits, positions)]
+        return positions
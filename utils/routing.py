@@ -0,0 +1,329 @@
+"""Offline road-network travel times between venues and the base camp.
+
+The road graph is a compact CSR adjacency file (``data/roads.npz``) built
+from a GeoJSON export of an OSM extract (e.g. ``osmium export`` or
+``ogr2ogr`` of the ``lines`` layer)::
+
+    python -m utils.routing data/damyang-roads.geojson
+
+A region's graph is the catalog entry's ``roads`` file; the default
+region also picks up ``data/roads.npz``. Without a graph file every
+function here falls back to straight-line distance with a detour factor,
+so pages keep working.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.catalog import load_catalog
+from utils.data_loader import DATA_PATH, distances_from, get_venue_store, paired_distances
+
+GRAPH_PATH = DATA_PATH.parent / "roads.npz"
+CACHE_DIR = DATA_PATH.parent / "cache"
+
+# Default speeds per OSM highway class (km/h); 0 means the mode may not use it
+DRIVE_KPH = {
+    "motorway": 100, "motorway_link": 60, "trunk": 80, "trunk_link": 50,
+    "primary": 60, "primary_link": 40, "secondary": 50, "secondary_link": 35,
+    "tertiary": 40, "tertiary_link": 30, "unclassified": 30, "residential": 30,
+    "living_street": 10, "service": 20, "track": 15,
+}
+NO_WALKING = {"motorway", "motorway_link", "trunk", "trunk_link"}
+WALK_KPH = 4.5
+
+MODES = ("drive", "walk")
+DETOUR_FACTOR = 1.3  # road vs straight-line distance when no graph is available
+
+
+class RoadGraph:
+    """Directed road graph in CSR form with per-mode edge travel times."""
+
+    def __init__(self, node_lat, node_lng, indptr, indices, length_m, drive_kph, walk_kph, digest: str = ""):
+        self.node_lat = np.asarray(node_lat, dtype=np.float64)
+        self.node_lng = np.asarray(node_lng, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.length_m = np.asarray(length_m, dtype=np.float64)
+        self.speeds = {"drive": np.asarray(drive_kph, dtype=np.float64), "walk": np.asarray(walk_kph, dtype=np.float64)}
+        self.digest = digest
+        self._seconds = {}
+        self._node_index = None
+
+    @classmethod
+    def load(cls, path: Path = GRAPH_PATH) -> "RoadGraph":
+        """Load a graph written by ``build_road_graph``."""
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        with np.load(path) as arrays:
+            return cls(**{key: arrays[key] for key in arrays.files}, digest=digest)
+
+    @property
+    def size(self) -> int:
+        return len(self.node_lat)
+
+    def edge_seconds(self, mode: str) -> np.ndarray:
+        """Travel time of every edge for a mode (inf where the mode is not allowed)."""
+        if mode not in self._seconds:
+            kph = self.speeds[mode]
+            with np.errstate(divide="ignore"):
+                self._seconds[mode] = np.where(kph > 0, self.length_m / (kph / 3.6), np.inf)
+        return self._seconds[mode]
+
+    def snap(self, lats, lngs) -> np.ndarray:
+        """Get the nearest graph node of every point."""
+        from utils.spatial import SpatialIndex
+
+        if self._node_index is None:
+            self._node_index = SpatialIndex(self.node_lat, self.node_lng, cell_km=0.5)
+        return np.array(
+            [self._node_index.nearest((lat, lng), 1)[0][0] for lat, lng in zip(lats, lngs)], dtype=np.int64
+        )
+
+    def dijkstra(self, source: int, mode: str = "drive", targets=None) -> np.ndarray:
+        """Get travel seconds from ``source`` to every node (inf if unreachable).
+
+        Stops early once every node in ``targets`` is settled.
+        """
+        seconds = self.edge_seconds(mode)
+        best = np.full(self.size, np.inf)
+        best[source] = 0.0
+        remaining = set(int(t) for t in targets) if targets is not None else None
+        indptr, indices = self.indptr, self.indices
+        heap = [(0.0, source)]
+        settled = np.zeros(self.size, dtype=bool)
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if settled[node]:
+                continue
+            settled[node] = True
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+            for edge in range(indptr[node], indptr[node + 1]):
+                nxt = indices[edge]
+                candidate = cost + seconds[edge]
+                if candidate < best[nxt]:
+                    best[nxt] = candidate
+                    heapq.heappush(heap, (candidate, nxt))
+        return best
+
+    def astar(self, source: int, target: int, mode: str = "drive") -> float:
+        """Get travel seconds between two nodes with A* (inf if unreachable).
+
+        The heuristic is straight-line distance at the mode's top speed,
+        which never overestimates.
+        """
+        seconds = self.edge_seconds(mode)
+        top_mps = max(float(self.speeds[mode].max()), 1e-9) / 3.6
+        target_lat, target_lng = self.node_lat[target], self.node_lng[target]
+
+        def heuristic(node: int) -> float:
+            km = distances_from(target_lat, target_lng, self.node_lat[node:node + 1], self.node_lng[node:node + 1])[0]
+            return km * 1000 / top_mps
+
+        best = {source: 0.0}
+        heap = [(heuristic(source), 0.0, source)]
+        settled = set()
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node == target:
+                return cost
+            if node in settled:
+                continue
+            settled.add(node)
+            for edge in range(self.indptr[node], self.indptr[node + 1]):
+                nxt = int(self.indices[edge])
+                candidate = cost + seconds[edge]
+                if candidate < best.get(nxt, math.inf):
+                    best[nxt] = candidate
+                    heapq.heappush(heap, (candidate + heuristic(nxt), candidate, nxt))
+        return math.inf
+
+    def time_matrix(self, nodes, mode: str = "drive") -> np.ndarray:
+        """Get travel seconds between every pair of ``nodes`` (one Dijkstra per unique node)."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        unique, inverse = np.unique(nodes, return_inverse=True)
+        rows = np.vstack([self.dijkstra(int(node), mode, targets=unique)[unique] for node in unique]) \
+            if len(unique) else np.zeros((0, 0))
+        return rows[np.ix_(inverse.ravel(), inverse.ravel())]
+
+
+def build_road_graph(geojson_path: Path, target: Path = GRAPH_PATH) -> Path:
+    """Convert GeoJSON road LineStrings (OSM tags as properties) into a CSR graph file."""
+    with open(geojson_path, "r", encoding="utf-8") as f:
+        features = json.load(f)["features"]
+
+    node_ids = {}
+    lats, lngs = [], []
+    sources, targets, drive, walk = [], [], [], []
+
+    def node(lng: float, lat: float) -> int:
+        key = (round(lat, 7), round(lng, 7))
+        if key not in node_ids:
+            node_ids[key] = len(lats)
+            lats.append(key[0])
+            lngs.append(key[1])
+        return node_ids[key]
+
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        props = feature.get("properties") or {}
+        highway = props.get("highway")
+        if highway is None:
+            continue
+        lines = {"LineString": [geometry.get("coordinates")],
+                 "MultiLineString": geometry.get("coordinates")}.get(geometry.get("type"), [])
+        drive_kph = float(DRIVE_KPH.get(highway, 0))
+        if str(props.get("maxspeed", "")).isdigit() and drive_kph > 0:
+            drive_kph = float(props["maxspeed"])
+        walk_kph = 0.0 if highway in NO_WALKING else WALK_KPH
+        oneway = str(props.get("oneway", "no")).lower() in ("yes", "true", "1")
+
+        for line in lines:
+            ids = [node(lng, lat) for lng, lat, *_ in line]
+            for a, b in zip(ids, ids[1:]):
+                if a == b:
+                    continue
+                sources += [a, b]
+                targets += [b, a]
+                drive += [drive_kph, 0.0 if oneway else drive_kph]
+                walk += [walk_kph, walk_kph]
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    node_lat, node_lng = np.asarray(lats), np.asarray(lngs)
+    order = np.argsort(sources, kind="stable")
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(lats)))])
+    length_m = np.zeros(len(sources))
+    for start in range(0, len(sources), 1 << 20):
+        a, b = sources[start:start + (1 << 20)], targets[start:start + (1 << 20)]
+        length_m[start:start + len(a)] = paired_distances(node_lat[a], node_lng[a], node_lat[b], node_lng[b]) * 1000
+
+    np.savez(
+        target,
+        node_lat=node_lat,
+        node_lng=node_lng,
+        indptr=indptr,
+        indices=targets[order].astype(np.int32),
+        length_m=length_m[order].astype(np.float32),
+        drive_kph=np.asarray(drive, dtype=np.float32)[order],
+        walk_kph=np.asarray(walk, dtype=np.float32)[order],
+    )
+    return target
+
+
+_graphs = {}  # path -> ((mtime_ns, size), graph)
+_graph_lock = threading.Lock()
+_matrices = LRUCache(maxsize=4)
+_base_minutes = LRUCache(maxsize=8)
+
+
+def _graph_path(region: Optional[str] = None) -> Optional[Path]:
+    """The road graph file of a region, if it has one."""
+    catalog = load_catalog()
+    entry = catalog.resolve(region)
+    path = entry.roads or (GRAPH_PATH if entry.id == catalog.default else None)
+    return path if path is not None and path.exists() else None
+
+
+def get_road_graph(region: Optional[str] = None) -> Optional[RoadGraph]:
+    """Get the process-wide road graph of a region, or None when it has no graph file.
+
+    The file is loaded again when its mtime or size changes (a rebuilt graph).
+    """
+    path = _graph_path(region)
+    if path is None:
+        return None
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _graph_lock:
+        loaded = _graphs.get(path)
+        if loaded is None or loaded[0] != signature:
+            loaded = _graphs[path] = (signature, RoadGraph.load(path))
+        return loaded[1]
+
+
+def estimate_minutes(km, mode: str = "drive"):
+    """Estimate travel minutes from straight-line km with a detour factor."""
+    kph = 30.0 if mode == "drive" else WALK_KPH
+    return np.asarray(km) * DETOUR_FACTOR / kph * 60
+
+
+def get_venue_travel_matrix(mode: str = "drive", region: Optional[str] = None) -> np.ndarray:
+    """Get travel minutes between all points, base camp first, then store rows.
+
+    Row/column 0 is the base camp and row ``i + 1`` is venue row ``i`` of
+    ``get_venues_df()``. Computed once per (graph, dataset version, mode)
+    and cached in memory and on disk under ``data/cache``. This is one
+    Dijkstra per venue and O(N²) memory, meant for itinerary planning;
+    base camp times alone come from ``get_travel_minutes``.
+    """
+    store = get_venue_store(region)
+    graph = get_road_graph(region)
+    accommodation = store.accommodation
+    lats = np.concatenate([[accommodation["lat"]], store.df["lat"].to_numpy(dtype=np.float64)])
+    lngs = np.concatenate([[accommodation["lng"]], store.df["lng"].to_numpy(dtype=np.float64)])
+
+    if graph is None:
+        from utils.data_loader import distance_matrix
+
+        points = np.column_stack([lats, lngs])
+        return _matrices.get_or_create(
+            ("estimate", store.version, mode),
+            lambda: estimate_minutes(distance_matrix(points, points), mode),
+        )
+
+    def compute():
+        path = CACHE_DIR / f"travel-{graph.digest}-{store.version}-{mode}.npy"
+        if path.exists():
+            return np.load(path)
+        matrix = graph.time_matrix(graph.snap(lats, lngs), mode) / 60
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(path, matrix)
+        return matrix
+
+    return _matrices.get_or_create((graph.digest, store.version, mode), compute)
+
+
+def get_travel_minutes(mode: str = "drive", region: Optional[str] = None) -> pd.Series:
+    """Get base camp to venue travel minutes, indexed like ``get_venues_df()``.
+
+    A single Dijkstra from the base camp node, stopping once every venue
+    node is settled; cached per (graph, dataset version, mode).
+    """
+    store = get_venue_store(region)
+    graph = get_road_graph(region)
+    accommodation = store.accommodation
+    lats = store.df["lat"].to_numpy(dtype=np.float64)
+    lngs = store.df["lng"].to_numpy(dtype=np.float64)
+
+    def compute():
+        if graph is None:
+            return estimate_minutes(distances_from(accommodation["lat"], accommodation["lng"], lats, lngs), mode)
+        base = int(graph.snap([accommodation["lat"]], [accommodation["lng"]])[0])
+        nodes = graph.snap(lats, lngs)
+        return graph.dijkstra(base, mode, targets=np.unique(nodes))[nodes] / 60
+
+    key = (graph.digest if graph is not None else "estimate", store.version, mode)
+    return pd.Series(_base_minutes.get_or_create(key, compute), index=store.df.index, name="travel_min")
+
+
+def has_road_graph(region: Optional[str] = None) -> bool:
+    """Check whether travel times come from a road graph rather than an estimate."""
+    return get_road_graph(region) is not None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m utils.routing ROADS.geojson")
+    print(f"Wrote {build_road_graph(Path(sys.argv[1]))}")
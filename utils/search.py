@@ -0,0 +1,237 @@
+"""Inverted index for Korean full-text venue search."""
+
+import unicodedata
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.hangul import HangulPrefixIndex, prefix_matches
+
+SEARCH_COLUMNS = ("name", "feature", "address", "subcategory", "note")
+PREFIX_COLUMNS = ("name", "feature")
+
+
+def normalize_text(text) -> str:
+    """Normalize text for matching: NFC-composed Hangul, lowercase, single spaces."""
+    if not isinstance(text, str):
+        if text is None or pd.isna(text):
+            return ""
+        text = str(text)
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def tokenize(text: str) -> set:
+    """Get the character unigrams and bigrams of every word in normalized text.
+
+    Hangul syllables are single code points after NFC, so a bigram is two
+    syllables ("소금빵" -> "소금", "금빵") rather than two jamo.
+    """
+    tokens = set()
+    for word in text.split():
+        tokens.update(word)
+        tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _query_terms(query: str) -> list:
+    """Split a search query into normalized terms."""
+    return normalize_text(query).split()
+
+
+def _row_text(row: tuple) -> str:
+    """Join a row's searchable fields; the newline keeps terms from spanning fields."""
+    return "\n".join(normalize_text(value) for value in row)
+
+
+class SearchIndex:
+    """Character n-gram inverted index over the searchable venue columns.
+
+    Postings are sorted arrays of row positions. A term's candidates are the
+    intersection of its bigram postings (rarest first), which are then
+    verified as substrings, so query cost follows the number of matches.
+    Terms also match as chosung/jamo prefixes of name and feature words
+    ("ㅅㄱㅃ", "속" -> "소금빵") through a lazily built ``HangulPrefixIndex``.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: tuple = SEARCH_COLUMNS):
+        self.columns = tuple(c for c in columns if c in df.columns)
+        self.ids = df["id"].to_numpy() if "id" in df.columns else np.arange(len(df))
+        self.size = len(df)
+        self._texts = [_row_text(row) for row in zip(*(df[c] for c in self.columns))]
+        self._prefix_texts = [_row_text(row) for row in zip(*(df[c] for c in PREFIX_COLUMNS if c in df.columns))]
+        self._prefix_index = None
+
+        postings = {}
+        for position, text in enumerate(self._texts):
+            for token in tokenize(text):
+                postings.setdefault(token, []).append(position)
+        self._postings = {token: np.asarray(rows, dtype=np.int64) for token, rows in postings.items()}
+
+    @classmethod
+    def from_arrays(cls, df: pd.DataFrame, arrays: dict) -> "SearchIndex":
+        """Rebuild an index of ``df`` from ``to_arrays`` output without tokenizing."""
+        index = cls.__new__(cls)
+        index.columns = tuple(arrays["columns"])
+        index.ids = df["id"].to_numpy() if "id" in df.columns else np.arange(len(df))
+        index.size = len(df)
+        index._texts = list(arrays["texts"])
+        index._prefix_texts = list(arrays["prefix_texts"])
+        index._prefix_index = None
+        offsets, positions = arrays["offsets"], arrays["positions"]
+        index._postings = {
+            token: positions[offsets[i]:offsets[i + 1]] for i, token in enumerate(arrays["tokens"])
+        }
+        return index
+
+    def to_arrays(self) -> dict:
+        """The index as flat arrays: postings in CSR form (tokens, offsets, positions) and row texts."""
+        tokens = list(self._postings)
+        lengths = np.fromiter((len(self._postings[token]) for token in tokens), dtype=np.int64, count=len(tokens))
+        return {
+            "columns": list(self.columns),
+            "tokens": tokens,
+            "offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            "positions": np.concatenate([self._postings[token] for token in tokens] or [np.zeros(0, dtype=np.int64)]),
+            "texts": self._texts,
+            "prefix_texts": self._prefix_texts,
+        }
+
+    def updated(self, df: pd.DataFrame, sources: np.ndarray, changed: np.ndarray) -> "SearchIndex":
+        """Index ``df`` by reusing this index's entries for unchanged rows.
+
+        ``sources[i]`` is row ``i``'s position in this index (ignored where
+        ``changed[i]``); only changed rows are tokenized. When unchanged rows
+        keep their positions, only postings of tokens touched by changed or
+        removed rows are rewritten. Built prefix indexes are carried over the
+        same way.
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index.columns = self.columns
+        index.ids = df["id"].to_numpy()
+        index.size = len(df)
+
+        kept = np.flatnonzero(~changed)
+        remap = np.full(self.size, -1, dtype=np.int64)
+        remap[sources[kept]] = kept
+        new_rows = np.flatnonzero(changed)
+        subset = df.iloc[new_rows]
+        new_texts = [_row_text(row) for row in zip(*(subset[c] for c in self.columns))]
+        new_prefix_texts = [_row_text(row) for row in zip(*(subset[c] for c in PREFIX_COLUMNS if c in df.columns))]
+        index._texts = [self._texts[p] if p >= 0 else "" for p in sources.tolist()]
+        index._prefix_texts = [self._prefix_texts[p] if p >= 0 else "" for p in sources.tolist()]
+        for position, text, prefix_text in zip(new_rows.tolist(), new_texts, new_prefix_texts):
+            index._texts[position] = text
+            index._prefix_texts[position] = prefix_text
+        # Prefix indexes are carried over too once built; otherwise they stay lazy
+        index._prefix_index = None
+        if self._prefix_index is not None:
+            index._prefix_index = self._prefix_index.updated(index._prefix_texts, remap, new_rows.tolist())
+
+        additions = {}
+        for position, text in zip(new_rows.tolist(), new_texts):
+            for token in tokenize(text):
+                additions.setdefault(token, []).append(position)
+
+        in_place = np.array_equal(remap[remap >= 0], np.flatnonzero(remap >= 0))
+        if in_place:
+            # Unchanged rows keep their positions: rewrite only touched postings
+            postings = dict(self._postings)
+            touched = set(additions)
+            for position in np.flatnonzero(remap < 0).tolist():
+                touched |= tokenize(self._texts[position])
+        else:
+            postings = {}
+            touched = self._postings.keys() | additions.keys()
+
+        for token in touched:
+            rows = self._postings.get(token)
+            rows = remap[rows] if rows is not None else np.zeros(0, dtype=np.int64)
+            rows = rows[rows >= 0]
+            if token in additions:
+                # Changed rows were dropped above, so the two sides are disjoint
+                rows = np.sort(np.concatenate([rows, additions[token]]))
+            elif not in_place:
+                rows = np.sort(rows)
+            if len(rows):
+                postings[token] = rows
+            else:
+                postings.pop(token, None)
+        index._postings = postings
+        return index
+
+    @property
+    def prefix_index(self) -> HangulPrefixIndex:
+        """Jamo prefix indexes, built on first use to keep store loading fast."""
+        if self._prefix_index is None:
+            self._prefix_index = HangulPrefixIndex(self._prefix_texts)
+        return self._prefix_index
+
+    def _term_positions(self, term: str) -> np.ndarray:
+        """Row positions whose text contains ``term`` or a word starting with it."""
+        return np.union1d(self._substring_positions(term), self.prefix_index.lookup(term))
+
+    def _substring_positions(self, term: str) -> np.ndarray:
+        """Row positions whose text contains ``term``."""
+        grams = [term] if len(term) == 1 else [term[i:i + 2] for i in range(len(term) - 1)]
+        lists = []
+        for gram in set(grams):
+            rows = self._postings.get(gram)
+            if rows is None:
+                return np.zeros(0, dtype=np.int64)
+            lists.append(rows)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                return candidates
+        if len(term) <= 2:
+            return candidates
+        return np.asarray([p for p in candidates if term in self._texts[p]], dtype=np.int64)
+
+    def query(self, text: str, mode: str = "and") -> np.ndarray:
+        """Get sorted row positions matching all ("and") or any ("or") query terms."""
+        terms = _query_terms(text)
+        if not terms:
+            return np.arange(self.size)
+
+        result = None
+        for term in terms:
+            rows = self._term_positions(term)
+            if result is None:
+                result = rows
+            elif mode == "or":
+                result = np.union1d(result, rows)
+            else:
+                result = np.intersect1d(result, rows, assume_unique=True)
+        return np.sort(result)
+
+    def query_ids(self, text: str, mode: str = "and") -> set:
+        """Get the ids of venues matching the query."""
+        return set(self.ids[self.query(text, mode)].tolist())
+
+
+def search_mask(df: pd.DataFrame, query: str, mode: str = "and", columns: Optional[tuple] = None) -> pd.Series:
+    """Scan-based equivalent of ``SearchIndex.query`` for frames without an index."""
+    columns = tuple(c for c in (columns or SEARCH_COLUMNS) if c in df.columns)
+    terms = _query_terms(query)
+    if not terms:
+        return pd.Series(True, index=df.index)
+
+    texts = pd.Series(
+        [_row_text(row) for row in zip(*(df[c] for c in columns))], index=df.index, dtype=object
+    )
+    prefix_texts = pd.Series(
+        [_row_text(row) for row in zip(*(df[c] for c in PREFIX_COLUMNS if c in df.columns))],
+        index=df.index, dtype=object
+    )
+    masks = [
+        texts.str.contains(term, regex=False) | prefix_texts.map(lambda text: prefix_matches(text, term))
+        for term in terms
+    ]
+    combined = masks[0]
+    for mask in masks[1:]:
+        combined = (combined | mask) if mode == "or" else (combined & mask)
+    return combined
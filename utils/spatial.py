@@ -0,0 +1,118 @@
+"""Grid spatial index for radius and k-nearest venue queries."""
+
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import EARTH_RADIUS_KM, distances_from
+
+
+class SpatialIndex:
+    """Uniform grid over equirectangular-projected coordinates.
+
+    Points are bucketed into square cells of ``cell_km`` and stored sorted by
+    cell key, so every grid column of a query window is one contiguous slice
+    found with ``searchsorted``. Queries only measure exact haversine
+    distances for points in the candidate cells.
+    """
+
+    def __init__(self, lats, lngs, categories=None, cell_km: float = 1.0):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.categories = None
+        if categories is not None:
+            codes, uniques = pd.factorize(np.asarray(categories, dtype=object))
+            self.categories = np.asarray(uniques, dtype=object)
+            self._category_codes = codes
+            self._category_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.cell_km = cell_km
+        self.size = len(self.lats)
+
+        self._lat0 = float(np.mean(self.lats)) if self.size else 0.0
+        self._cos_lat0 = math.cos(math.radians(self._lat0))
+        x, y = self._project(self.lats, self.lngs)
+        ix = np.floor(x / cell_km).astype(np.int64)
+        iy = np.floor(y / cell_km).astype(np.int64)
+        self._ix_min = int(ix.min()) if self.size else 0
+        self._iy_min = int(iy.min()) if self.size else 0
+        self._ix_max = int(ix.max()) if self.size else 0
+        self._iy_max = int(iy.max()) if self.size else 0
+        self._ny = self._iy_max - self._iy_min + 1
+
+        keys = (ix - self._ix_min) * self._ny + (iy - self._iy_min)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def _project(self, lats, lngs) -> tuple:
+        """Project degrees to km on a plane tangent at the index's mean latitude."""
+        x = np.radians(lngs) * EARTH_RADIUS_KM * self._cos_lat0
+        y = np.radians(lats) * EARTH_RADIUS_KM
+        return x, y
+
+    def _candidates(self, lat: float, lng: float, km: float) -> np.ndarray:
+        """Row positions of all points in cells overlapping the query window."""
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # Widen the x extent for the query's latitude band (meridians converge)
+        band = min(abs(lat) + math.degrees(km / EARTH_RADIUS_KM), 89.9)
+        half_x = km * self._cos_lat0 / math.cos(math.radians(band))
+        x, y = self._project(lat, lng)
+        ix0 = max(math.floor((x - half_x) / self.cell_km), self._ix_min)
+        ix1 = min(math.floor((x + half_x) / self.cell_km), self._ix_max)
+        iy0 = max(math.floor((y - km) / self.cell_km), self._iy_min)
+        iy1 = min(math.floor((y + km) / self.cell_km), self._iy_max)
+        if ix0 > ix1 or iy0 > iy1:
+            return np.zeros(0, dtype=np.int64)
+
+        columns = np.arange(ix0, ix1 + 1, dtype=np.int64) - self._ix_min
+        lo = np.searchsorted(self._keys, columns * self._ny + (iy0 - self._iy_min), side="left")
+        hi = np.searchsorted(self._keys, columns * self._ny + (iy1 - self._iy_min), side="right")
+        slices = [self._order[a:b] for a, b in zip(lo, hi) if b > a]
+        if not slices:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    def within_radius(self, point: tuple, km: float) -> np.ndarray:
+        """Get row positions of points within ``km`` of ``point`` (lat, lng)."""
+        lat, lng = point
+        candidates = self._candidates(lat, lng, km)
+        distances = distances_from(lat, lng, self.lats[candidates], self.lngs[candidates])
+        return candidates[distances <= km]
+
+    def nearest(self, point: tuple, k: int, categories: Optional[list] = None) -> tuple:
+        """Get (positions, distances_km) of the ``k`` nearest points, closest first.
+
+        The search window doubles until it holds ``k`` matching points that
+        are closer than the window's inscribed radius.
+        """
+        lat, lng = point
+        if k <= 0 or self.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        wanted = None
+        total = self.size
+        if categories:
+            wanted = np.flatnonzero(np.isin(self.categories, categories))
+            total = int(self._category_counts[wanted].sum())
+        radius = self.cell_km
+        while True:
+            candidates = self._candidates(lat, lng, radius)
+            if wanted is not None:
+                candidates = candidates[np.isin(self._category_codes[candidates], wanted)]
+            distances = distances_from(lat, lng, self.lats[candidates], self.lngs[candidates])
+            inside = distances <= radius
+            covers_all = len(candidates) == total
+            if inside.sum() >= k or covers_all:
+                break
+            radius *= 2
+
+        if not covers_all:
+            candidates, distances = candidates[inside], distances[inside]
+        if len(candidates) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[top], distances[top]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
@@ -0,0 +1,141 @@
+"""Opt-in timing spans for Streamlit reruns.
+
+Run with ``DREAMTRIP_TRACE=1`` to record wall and CPU time per span
+(``DREAMTRIP_TRACE=alloc`` also traces allocations, which slows everything
+down). Pages call ``start_rerun`` first and ``finish_rerun`` last; finished
+spans are appended as JSON lines to ``data/cache/trace.jsonl`` (or
+``DREAMTRIP_TRACE_FILE``) and shown in the page's timing panel. With
+tracing off, ``span`` returns a shared no-op context and ``traced`` leaves
+functions unwrapped.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+TRACE_MODE = os.environ.get("DREAMTRIP_TRACE", "")
+TRACING_ENABLED = TRACE_MODE not in ("", "0")
+TRACE_PATH = Path(os.environ.get(
+    "DREAMTRIP_TRACE_FILE", Path(__file__).parent.parent / "data" / "cache" / "trace.jsonl"
+))
+
+_local = threading.local()  # each Streamlit session reruns its script in its own thread
+_write_lock = threading.Lock()
+_NO_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    """Times one block into the current thread's rerun; a no-op outside a rerun."""
+
+    __slots__ = ("name", "attrs", "rerun", "depth", "wall", "cpu", "alloc")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.rerun = getattr(_local, "rerun", None)
+        if self.rerun is not None:
+            self.depth = self.rerun["depth"]
+            self.rerun["depth"] += 1
+            self.alloc = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+            self.cpu = time.thread_time()
+            self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.rerun is None:
+            return False
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        record = {
+            "name": self.name,
+            "depth": self.depth,
+            "start_ms": round((self.wall - self.rerun["started"]) * 1000, 3),
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+        }
+        if self.alloc is not None:
+            record["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - self.alloc) / 1024, 1)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(self.attrs)
+        self.rerun["depth"] -= 1
+        self.rerun["spans"].append(record)
+        return False
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block as a span (extra ``attrs`` go into its record)."""
+    return _Span(name, attrs) if TRACING_ENABLED else _NO_SPAN
+
+
+def traced(func: Callable) -> Callable:
+    """Decorator recording every call of ``func`` as a span named module.function."""
+    if not TRACING_ENABLED:
+        return func
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Span(name, {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def start_rerun(page: str) -> None:
+    """Begin collecting spans for this thread's script run."""
+    if not TRACING_ENABLED:
+        return
+    if TRACE_MODE == "alloc" and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.rerun = {
+        "id": uuid.uuid4().hex[:12],
+        "page": page,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "started": time.perf_counter(),
+        "depth": 0,
+        "spans": [],
+    }
+
+
+def finish_rerun() -> list:
+    """End the current run: append its spans to the trace file and return them in start order."""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return []
+    _local.rerun = None
+    total = {
+        "name": "rerun", "depth": -1, "start_ms": 0.0,
+        "wall_ms": round((time.perf_counter() - rerun["started"]) * 1000, 3),
+    }
+    spans = [total] + sorted(rerun["spans"], key=lambda record: (record["start_ms"], record["depth"]))
+    lines = [
+        json.dumps({"rerun": rerun["id"], "page": rerun["page"], "time": rerun["time"], **record}, ensure_ascii=False)
+        for record in spans
+    ]
+    with _write_lock:
+        TRACE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(TRACE_PATH, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return spans
+
+
+def spans_frame(spans: list) -> pd.DataFrame:
+    """Tabulate spans for display, nesting shown by indentation."""
+    return pd.DataFrame({
+        "span": ["  " * (record["depth"] + 1) + record["name"] for record in spans],
+        "start_ms": [record["start_ms"] for record in spans],
+        "wall_ms": [record["wall_ms"] for record in spans],
+        "cpu_ms": [record.get("cpu_ms") for record in spans],
+        "alloc_kb": [record.get("alloc_kb") for record in spans],
+    })
@@ -0,0 +1,305 @@
+"""Folium venue map rendering with a per-filter HTML cache."""
+
+import itertools
+import threading
+from typing import Optional
+
+import folium
+import numpy as np
+from branca.element import MacroElement
+from folium.utilities import JsCode
+from jinja2 import Template
+
+from utils.cache import LRUCache
+from utils.clustering import ClusterPyramid
+from utils.data_loader import CATEGORY_INFO, get_category_color, get_venue_store
+from utils.tracing import traced
+
+CLUSTER_THRESHOLD = 200  # venues shown before "auto" switches to clustering
+CLUSTER_MAX_ZOOM = 18  # Leaflet's deepest zoom
+MAP_FEATURE_BUDGET = 2000  # markers a clustered map may emit across all zoom layers
+
+# Client-side styling from feature properties (colors come from CATEGORY_INFO)
+STYLE_VENUE_JS = JsCode("""
+function(feature, layer) {
+    layer.setStyle({color: "white", fillColor: feature.properties.color});
+}
+""")
+
+STYLE_CLUSTER_JS = JsCode("""
+function(feature, layer) {
+    var n = feature.properties.count;
+    var size = n === 1 ? 14 : n < 10 ? 28 : n < 100 ? 34 : 42;
+    var html = n === 1
+        ? '<div style="width:14px; height:14px; border-radius:50%; border:2px solid white; background:'
+            + feature.properties.color + ';"></div>'
+        : '<div style="width:' + size + 'px; height:' + size + 'px; line-height:' + size + 'px; '
+            + 'border-radius:50%; background:rgba(93, 64, 55, 0.85); border:2px solid #F5EDE4; '
+            + 'color:white; text-align:center; font:600 12px sans-serif;">' + n + '</div>';
+    layer.setIcon(L.divIcon({html: html, className: "", iconSize: [size, size], iconAnchor: [size / 2, size / 2]}));
+}
+""")
+
+# One entry per category checkbox combination, for a few regions at a time
+_map_cache = LRUCache(maxsize=2 ** len(CATEGORY_INFO) * 4)
+_pyramid_cache = LRUCache(maxsize=4)
+_prewarmed = set()
+_prewarm_lock = threading.Lock()
+
+
+def _category_key(categories) -> tuple:
+    """Normalize selected categories to a hashable tuple in CATEGORY_INFO order."""
+    selected = set(categories or ())
+    return tuple(cat for cat in CATEGORY_INFO if cat in selected)
+
+
+class ZoomLayerSwitch(MacroElement):
+    """Show exactly one of several layers depending on the map's zoom level.
+
+    ``layers`` maps the lowest zoom at which each layer applies to the layer;
+    zooms below the smallest key use the first layer.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var map = {{ this._parent.get_name() }};
+            var bands = [{% for zoom, layer in this.layers %}[{{ zoom }}, {{ layer.get_name() }}],{% endfor %}];
+            function sync() {
+                var zoom = map.getZoom(), active = bands[0][1];
+                bands.forEach(function(band) { if (zoom >= band[0]) { active = band[1]; } });
+                bands.forEach(function(band) {
+                    if (band[1] === active) { map.addLayer(band[1]); } else { map.removeLayer(band[1]); }
+                });
+            }
+            map.on("zoomend", sync);
+            sync();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, layers: dict):
+        super().__init__()
+        self._name = "ZoomLayerSwitch"
+        self.layers = sorted(layers.items())
+
+
+def _get_cluster_pyramid(store) -> ClusterPyramid:
+    """Get the cluster pyramid for the store's dataset version, built once."""
+    return _pyramid_cache.get_or_create(
+        store.version, lambda: ClusterPyramid(store.df["lat"], store.df["lng"], max_zoom=CLUSTER_MAX_ZOOM)
+    )
+
+
+def _radius_counts(store) -> tuple:
+    """Number of venues within 5km and 10km of the base camp."""
+    base = (store.accommodation["lat"], store.accommodation["lng"])
+    return tuple(len(store.spatial_index.within_radius(base, km)) for km in (5, 10))
+
+
+def venue_feature_collection(df, count=None, names=None) -> dict:
+    """Build a GeoJSON FeatureCollection of venue points from frame columns.
+
+    ``count``/``names`` override per-point properties for cluster layers,
+    which leave out the popup's ``feature`` text.
+    """
+    colors = df["category"].map(lambda cat: get_category_color(cat)).tolist()
+    lngs = np.round(df["lng"].to_numpy(dtype=np.float64), 6).tolist()
+    lats = np.round(df["lat"].to_numpy(dtype=np.float64), 6).tolist()
+    counts = [1] * len(df) if count is None else np.asarray(count).tolist()
+    names = df["name"].tolist() if names is None else names
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lng, lat]},
+            "properties": {"name": name, "color": color, "count": n},
+        }
+        for lng, lat, name, color, n in zip(lngs, lats, names, colors, counts)
+    ]
+    if count is None:
+        for properties, feature in zip((f["properties"] for f in features), df["feature"].fillna("").tolist()):
+            properties["feature"] = feature
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _venue_layer(collection: dict, name: str = "venues") -> folium.GeoJson:
+    """One GeoJSON layer of category-colored circle markers with popups."""
+    return folium.GeoJson(
+        collection,
+        name=name,
+        control=False,
+        marker=folium.CircleMarker(radius=7, weight=2, fill=True, fill_opacity=0.85),
+        on_each_feature=STYLE_VENUE_JS,
+        tooltip=folium.GeoJsonTooltip(fields=["name"], labels=False),
+        popup=folium.GeoJsonPopup(fields=["name", "feature"], labels=False, max_width=180),
+    )
+
+
+def _cluster_layer(collection: dict, name: str) -> folium.GeoJson:
+    """One GeoJSON layer of cluster count bubbles and single-venue dots."""
+    return folium.GeoJson(
+        collection,
+        name=name,
+        control=False,
+        marker=folium.Marker(),
+        on_each_feature=STYLE_CLUSTER_JS,
+        tooltip=folium.GeoJsonTooltip(fields=["name"], labels=False),
+    )
+
+
+def _add_cluster_layers(m: folium.Map, store, filtered_df) -> None:
+    """Add GeoJSON layers per zoom band and a script showing the right one.
+
+    Layers are emitted from the widest zoom in until ``MAP_FEATURE_BUDGET``
+    markers are used, so the page size does not grow with the venue count.
+    A zoom that groups venues exactly like the one below adds no layer.
+    Once every cluster is a single venue, the individual venue layer (with
+    popups) takes over; if the budget runs out first, the last cluster
+    layer stays on for the deeper zooms.
+    """
+    pyramid = _get_cluster_pyramid(store)
+    positions = store.df.index.get_indexer(filtered_df.index)
+    layers = {}
+    emitted = previous = 0
+    for zoom in range(pyramid.min_zoom, pyramid.max_zoom + 2):
+        if zoom > pyramid.max_zoom:
+            singles = True
+        else:
+            clusters = pyramid.clusters(zoom, positions)
+            if len(clusters["count"]) == previous:
+                continue
+            singles = int(clusters["count"].max(initial=1)) == 1
+        if singles:
+            if emitted + len(filtered_df) <= MAP_FEATURE_BUDGET or not layers:
+                layers[zoom] = _venue_layer(venue_feature_collection(filtered_df)).add_to(m)
+            break
+        if layers and emitted + len(clusters["count"]) > MAP_FEATURE_BUDGET:
+            break
+        members = store.df.iloc[clusters["position"]].assign(lat=clusters["lat"], lng=clusters["lng"])
+        names = [
+            name if n == 1 else f"{n}곳 · 확대해서 보기"
+            for name, n in zip(members["name"].tolist(), clusters["count"].tolist())
+        ]
+        layers[zoom] = _cluster_layer(
+            venue_feature_collection(members, count=clusters["count"], names=names), f"clusters-z{zoom}"
+        ).add_to(m)
+        previous = len(clusters["count"])
+        emitted += previous
+    ZoomLayerSwitch(layers).add_to(m)
+
+
+@traced
+def build_venue_map(categories=None, clustering: str = "auto", region: Optional[str] = None) -> folium.Map:
+    """Build the venue map for the selected categories (all when empty).
+
+    ``clustering`` is "on", "off" (one marker per venue) or "auto", which
+    clusters once more than ``CLUSTER_THRESHOLD`` venues are shown.
+    """
+    store = get_venue_store(region)
+    df = store.df
+    accommodation = store.accommodation
+    categories = _category_key(categories)
+    filtered_df = df[df["category"].isin(categories)] if categories else df
+
+    # Create map with warm tones
+    m = folium.Map(
+        location=[accommodation["lat"], accommodation["lng"]],
+        zoom_start=11,
+        tiles="cartodbpositron",
+    )
+
+    # Distance circles with warm colors
+    within_5km, within_10km = _radius_counts(store)
+
+    folium.Circle(
+        location=[accommodation["lat"], accommodation["lng"]],
+        radius=5000,
+        color="#5D4037",
+        weight=2,
+        fill=True,
+        fill_opacity=0.05,
+        popup=f"5km · {within_5km}곳",
+    ).add_to(m)
+
+    folium.Circle(
+        location=[accommodation["lat"], accommodation["lng"]],
+        radius=10000,
+        color="#C17F59",
+        weight=1,
+        fill=False,
+        popup=f"10km · {within_10km}곳",
+    ).add_to(m)
+
+    # Accommodation marker with emphasis
+    folium.CircleMarker(
+        location=[accommodation["lat"], accommodation["lng"]],
+        radius=18,
+        color="#dc2626",
+        weight=3,
+        fill=True,
+        fill_color="#fecaca",
+        fill_opacity=0.6,
+    ).add_to(m)
+
+    folium.Marker(
+        location=[accommodation["lat"], accommodation["lng"]],
+        popup=folium.Popup(
+            f"""<div style="text-align:center; min-width:120px; font-family: sans-serif;">
+                <b style="color:#dc2626;">🏡 BASE</b><br>
+                {accommodation['name'][:10]}...
+            </div>""",
+            max_width=150
+        ),
+        icon=folium.Icon(color="red", icon="home", prefix="fa"),
+    ).add_to(m)
+
+    # Venue markers (a single GeoJSON layer, styled client-side by category)
+    if clustering == "on" or (clustering == "auto" and len(filtered_df) > CLUSTER_THRESHOLD):
+        _add_cluster_layers(m, store, filtered_df)
+    elif len(filtered_df):
+        _venue_layer(venue_feature_collection(filtered_df)).add_to(m)
+
+    return m
+
+
+def get_venue_map_html(categories=None, clustering: str = "auto", region: Optional[str] = None) -> str:
+    """Get the rendered map HTML for the selected categories, cached per region and content.
+
+    A reload that only touched other categories (and left the distance
+    circle counts alone) keeps the cached render.
+    """
+    store = get_venue_store(region)
+    selected = _category_key(categories)
+    tag = store.content_tag(selected)
+    key = (store.region, tag, _radius_counts(store), selected, clustering)
+    if key not in _map_cache:
+        # Drop renders of the region's previous full builds
+        _map_cache.discard(lambda cached: cached[0] == store.region and cached[1][0] != tag[0])
+    return _map_cache.get_or_create(
+        key, lambda: build_venue_map(selected, clustering, store.region).get_root().render()
+    )
+
+
+def prewarm_venue_maps(region: Optional[str] = None) -> None:
+    """Render every category combination of a region in a background thread, once per region and process.
+
+    Pages warm the region they show, so a shared ``?region=`` link to a
+    region other than the default gets a warm map too.
+    """
+    region = get_venue_store(region).region
+    with _prewarm_lock:
+        if region in _prewarmed:
+            return
+        _prewarmed.add(region)
+
+    def warm():
+        for size in range(len(CATEGORY_INFO) + 1):
+            for combo in itertools.combinations(CATEGORY_INFO, size):
+                get_venue_map_html(combo, region=region)
+
+    threading.Thread(target=warm, name=f"venue-map-prewarm-{region}", daemon=True).start()
+
+
+def get_map_cache_stats() -> dict:
+    """Get map cache hit/miss/eviction counters."""
+    return _map_cache.stats()